@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.db.models import F
 from django.utils.html import format_html
 from .models import AIProcessingTask
 
@@ -21,6 +22,9 @@ class AIProcessingTaskAdmin(admin.ModelAdmin):
         'task_type', 'error_message', 'ai_model_version'
     ]
     ordering = ['-created_at']
+    list_select_related = ['invoice', 'invoice__user']
+    list_per_page = 50
+    show_full_result_count = False
     readonly_fields = [
         'created_at', 'updated_at', 'processing_duration_ms',
         'duration_display'
@@ -51,30 +55,40 @@ class AIProcessingTaskAdmin(admin.ModelAdmin):
 
     def invoice_link(self, obj):
         """Create a link to the invoice"""
-        if obj.invoice:
+        if obj.invoice_id:
             from django.urls import reverse
-            url = reverse('admin:invoices_invoice_change', args=[obj.invoice.pk])
-            return format_html('<a href="{}">{}</a>', url, obj.invoice)
+            url = reverse('admin:invoices_invoice_change', args=[obj.invoice_id])
+            label = getattr(obj, 'invoice_label', None) or f'Invoice {obj.invoice_id}'
+            return format_html('<a href="{}">{}</a>', url, label)
         return "—"
     invoice_link.short_description = 'Invoice'
 
     def duration_display(self, obj):
         """Display processing duration in a readable format"""
-        if obj.processing_duration_ms:
-            if obj.processing_duration_ms < 1000:
-                return f"{obj.processing_duration_ms}ms"
-            elif obj.processing_duration_ms < 60000:
-                return f"{obj.processing_duration_ms / 1000:.2f}s"
+        seconds = getattr(obj, '_duration_sec', None)
+        if seconds is None and obj.processing_duration_ms:
+            seconds = obj.processing_duration_ms / 1000
+        if seconds:
+            if seconds < 1:
+                return f"{int(seconds * 1000)}ms"
+            elif seconds < 60:
+                return f"{seconds:.2f}s"
             else:
-                minutes = obj.processing_duration_ms // 60000
-                seconds = (obj.processing_duration_ms % 60000) / 1000
-                return f"{minutes}m {seconds:.1f}s"
+                return f"{int(seconds // 60)}m {seconds % 60:.1f}s"
         return "—"
     duration_display.short_description = 'Duration'
 
     def get_queryset(self, request):
         """Filter queryset based on user permissions"""
-        qs = super().get_queryset(request)
+        qs = super().get_queryset(request).select_related('invoice', 'invoice__user')
+        # The changelist never renders the JSON payloads or error text
+        qs = qs.defer('input_data', 'output_data', 'error_message')
+        # Precompute the duration in seconds so duration_display does a
+        # single comparison per cell instead of re-deriving it in Python
+        qs = qs.annotate(
+            _duration_sec=F('processing_duration_ms') / 1000.0,
+            invoice_label=F('invoice__invoice_number')
+        )
         if not request.user.is_superuser:
             # Regular users can only see tasks for their invoices
             qs = qs.filter(invoice__user=request.user)
@@ -84,16 +98,11 @@ class AIProcessingTaskAdmin(admin.ModelAdmin):
 
     def retry_failed_tasks(self, request, queryset):
         """Retry selected failed tasks"""
-        failed_tasks = queryset.filter(status='failed')
-        retryable_tasks = failed_tasks.filter(retry_count__lt=3)
-
-        updated = 0
-        for task in retryable_tasks:
-            task.status = 'pending'
-            task.retry_count += 1
-            task.error_message = ''
-            task.save()
-            updated += 1
+        updated = queryset.filter(status='failed', retry_count__lt=3).update(
+            status='pending',
+            retry_count=F('retry_count') + 1,
+            error_message=''
+        )
 
         self.message_user(request, f'{updated} tasks queued for retry.')
     retry_failed_tasks.short_description = "Retry selected failed tasks"
@@ -24,10 +24,26 @@ class Command(BaseCommand):
             action='store_true',
             help='Show what would be processed without actually processing'
         )
+        parser.add_argument(
+            '--use-celery',
+            action='store_true',
+            help='Enqueue tasks onto the Celery queue instead of processing in-process'
+        )
+        parser.add_argument(
+            '--batch-submit',
+            action='store_true',
+            help='Submit pending extraction tasks via the OpenAI Batch API (50%% cheaper, 24h window)'
+        )
+        parser.add_argument(
+            '--collect-batches',
+            action='store_true',
+            help='Collect finished OpenAI batch results and apply them'
+        )
 
     def handle(self, *args, **options):
         max_tasks = options['max_tasks']
         dry_run = options['dry_run']
+        use_celery = options['use_celery']
 
         # Check if OpenAI API key is configured
         if not settings.OPENAI_API_KEY:
@@ -48,7 +64,11 @@ class Command(BaseCommand):
             )
             # Show pending tasks
             from ai_processing.models import AIProcessingTask
-            pending_tasks = AIProcessingTask.objects.filter(status='pending')[:max_tasks]
+            pending_tasks = list(
+                AIProcessingTask.objects.filter(status='pending')
+                .select_related('invoice')
+                .only('id', 'task_type', 'invoice__id')[:max_tasks]
+            )
 
             if pending_tasks:
                 self.stdout.write(f'Would process {len(pending_tasks)} tasks:')
@@ -58,6 +78,36 @@ class Command(BaseCommand):
                 self.stdout.write('No pending tasks found.')
             return
 
+        if options['batch_submit'] or options['collect_batches']:
+            from ai_processing.task_processor import (
+                collect_extraction_batches, submit_extraction_batch
+            )
+
+            if options['batch_submit']:
+                batch_id = submit_extraction_batch(max_tasks=max_tasks)
+                if batch_id:
+                    self.stdout.write(self.style.SUCCESS(f'Submitted OpenAI batch {batch_id}.'))
+                else:
+                    self.stdout.write(self.style.WARNING('No pending extraction tasks to batch.'))
+            if options['collect_batches']:
+                collected = collect_extraction_batches()
+                self.stdout.write(self.style.SUCCESS(f'Collected {collected} batch results.'))
+            return
+
+        if use_celery:
+            from ai_processing.tasks import enqueue_pending_tasks
+
+            enqueued_count = enqueue_pending_tasks(max_tasks=max_tasks)
+            if enqueued_count > 0:
+                self.stdout.write(
+                    self.style.SUCCESS(f'Enqueued {enqueued_count} tasks onto the Celery queue.')
+                )
+            else:
+                self.stdout.write(
+                    self.style.WARNING('No pending tasks found.')
+                )
+            return
+
         try:
             processed_count = process_pending_tasks(max_tasks=max_tasks)
 
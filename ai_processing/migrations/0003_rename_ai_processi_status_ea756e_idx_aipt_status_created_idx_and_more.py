@@ -0,0 +1,23 @@
+# Generated by Django 5.2.17 on 2026-08-30 15:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_processing', '0002_initial'),
+        ('invoices', '0003_remove_invoice_category_and_more'),
+    ]
+
+    operations = [
+        migrations.RenameIndex(
+            model_name='aiprocessingtask',
+            new_name='aipt_status_created_idx',
+            old_name='ai_processi_status_ea756e_idx',
+        ),
+        migrations.AddIndex(
+            model_name='aiprocessingtask',
+            index=models.Index(fields=['invoice', '-created_at'], name='ai_processi_invoice_b9378a_idx'),
+        ),
+    ]
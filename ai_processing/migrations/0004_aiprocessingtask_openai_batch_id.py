@@ -0,0 +1,18 @@
+# Generated by Django 5.2.17 on 2026-08-30 15:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_processing', '0003_rename_ai_processi_status_ea756e_idx_aipt_status_created_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aiprocessingtask',
+            name='openai_batch_id',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.17 on 2026-08-30 15:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_processing', '0004_aiprocessingtask_openai_batch_id'),
+        ('invoices', '0004_invoice_embedding'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='aiprocessingtask',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['created_at'], name='aitask_pending_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.17 on 2026-08-30 15:32
+
+import invoices.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_processing', '0005_aiprocessingtask_aitask_pending_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='aiprocessingtask',
+            name='input_data',
+            field=invoices.fields.OrjsonJSONField(blank=True, default=dict),
+        ),
+        migrations.AlterField(
+            model_name='aiprocessingtask',
+            name='output_data',
+            field=invoices.fields.OrjsonJSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.17 on 2026-08-30 15:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_processing', '0006_alter_aiprocessingtask_input_data_and_more'),
+        ('invoices', '0005_alter_invoice_embedding_alter_invoice_extracted_data'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='aiprocessingtask',
+            name='ai_processi_invoice_cc9d72_idx',
+        ),
+        migrations.AddIndex(
+            model_name='aiprocessingtask',
+            index=models.Index(fields=['invoice', 'task_type', 'status'], name='aipt_inv_type_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='aiprocessingtask',
+            index=models.Index(condition=models.Q(('status', 'completed')), fields=['completed_at'], name='aitask_completed_idx'),
+        ),
+    ]
@@ -1,6 +1,53 @@
+from django.apps import apps
+from django.core.cache import cache
 from django.db import models
+from django.db.models import Case, CharField, Q, Value, When
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.conf import settings
 
+from invoices.fields import OrjsonJSONField
+
+
+def stats_cache_key(user_id):
+    """Cache key for a user's processing-stats payload (versioned so the
+    schema can change without stale reads)."""
+    return f'v1:aiproc:stats:{user_id}'
+
+
+class AIProcessingTaskQuerySet(models.QuerySet):
+    """
+    QuerySet helpers for AIProcessingTask
+    """
+
+    def with_display(self):
+        """Annotate the choice display labels so serializers can read them
+        straight off the row instead of calling get_*_display per object."""
+        return self.annotate(
+            task_type_display_db=Case(
+                *[When(task_type=value, then=Value(label))
+                  for value, label in AIProcessingTask.TASK_TYPES],
+                output_field=CharField()
+            ),
+            status_display_db=Case(
+                *[When(status=value, then=Value(label))
+                  for value, label in AIProcessingTask.STATUS_CHOICES],
+                output_field=CharField()
+            )
+        )
+
+    def as_list_values(self):
+        """Flat dict projection for read-only list endpoints, skipping model
+        instance construction entirely. Keys line up with
+        AIProcessingTaskListSerializer's fields."""
+        return self.with_display().values(
+            'id', 'invoice', 'task_type', 'status', 'confidence_score',
+            'retry_count', 'started_at', 'completed_at', 'created_at',
+            invoice_number=models.F('invoice__invoice_number'),
+            task_type_display=models.F('task_type_display_db'),
+            status_display=models.F('status_display_db')
+        )
+
 
 class AIProcessingTask(models.Model):
     """
@@ -28,8 +75,8 @@ class AIProcessingTask(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
 
     # Processing details
-    input_data = models.JSONField(default=dict, blank=True)
-    output_data = models.JSONField(default=dict, blank=True)
+    input_data = OrjsonJSONField(default=dict, blank=True)
+    output_data = OrjsonJSONField(default=dict, blank=True)
     confidence_score = models.FloatField(default=0.0)
 
     # Error handling
@@ -45,19 +92,52 @@ class AIProcessingTask(models.Model):
     # Metadata
     ai_model_version = models.CharField(max_length=50, blank=True)
     processing_node = models.CharField(max_length=100, blank=True)
+    openai_batch_id = models.CharField(max_length=100, blank=True)  # OpenAI Batch API job id
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = AIProcessingTaskQuerySet.as_manager()
+
     class Meta:
         db_table = 'ai_processing_tasks'
         verbose_name = 'AI Processing Task'
         verbose_name_plural = 'AI Processing Tasks'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['invoice', 'task_type']),
-            models.Index(fields=['status', 'created_at']),
+            # Covers the (invoice, task_type, status) existence checks the
+            # bulk-create paths run, index-only
+            models.Index(
+                fields=['invoice', 'task_type', 'status'],
+                name='aipt_inv_type_status_idx'
+            ),
+            models.Index(fields=['status', 'created_at'], name='aipt_status_created_idx'),
+            models.Index(fields=['invoice', '-created_at']),
+            # Partial indexes kept tiny by only covering the worker poll
+            # queue and the completed rows that result queries read
+            models.Index(
+                fields=['created_at'], name='aitask_pending_idx',
+                condition=Q(status='pending')
+            ),
+            models.Index(
+                fields=['completed_at'], name='aitask_completed_idx',
+                condition=Q(status='completed')
+            ),
         ]
 
     def __str__(self):
         return f"{self.get_task_type_display()} for Invoice {self.invoice.id} - {self.status}"
+
+
+@receiver([post_save, post_delete], sender=AIProcessingTask,
+          dispatch_uid='aiproc_stats_cache_invalidation')
+def _invalidate_stats_cache(sender, instance, **kwargs):
+    """Drop the owner's cached stats whenever a task row changes.
+
+    Note bulk_create() and queryset update() skip signals; the view paths
+    that use those invalidate explicitly."""
+    user_id = apps.get_model('invoices', 'Invoice').objects.filter(
+        pk=instance.invoice_id
+    ).values_list('user_id', flat=True).first()
+    if user_id is not None:
+        cache.delete(stats_cache_key(user_id))
@@ -3,24 +3,226 @@ OpenAI Service for Invoice Processing
 Handles AI-powered invoice data extraction and analysis
 """
 
+import asyncio
+import functools
+import importlib.util
 import json
 import logging
+import re
 from typing import Dict, Any, Optional
 from decimal import Decimal
-from datetime import datetime
+from datetime import date, datetime
 
+import httpx
 import openai
+import orjson
+from pydantic import BaseModel, field_validator
+from tenacity import (
+    before_sleep_log, retry, retry_if_exception_type, stop_after_attempt,
+    wait_exponential_jitter
+)
+from rapidfuzz import fuzz, process as fuzz_process
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 
 logger = logging.getLogger(__name__)
 
+# Transient OpenAI failures worth retrying with backoff; request errors
+# (e.g. BadRequestError) fail immediately since retrying cannot fix them
+_RETRYABLE_OPENAI_ERRORS = (
+    openai.RateLimitError, openai.APIConnectionError, openai.APITimeoutError
+)
+
+_openai_retry = retry(
+    retry=retry_if_exception_type(_RETRYABLE_OPENAI_ERRORS),
+    wait=wait_exponential_jitter(initial=1, max=60),
+    stop=stop_after_attempt(5),
+    before_sleep=before_sleep_log(logger, logging.WARNING),
+    reraise=True
+)
+
+# Common company suffixes, longest first so the regex strips greedily
+COMPANY_SUFFIXES = (
+    'corporation', 'technologies', 'limited', 'systems', 'company',
+    'corp', 'tech', 'inc', 'llc', 'ltd', 'co'
+)
+_SUFFIX_RE = re.compile(r'\s+(' + '|'.join(COMPANY_SUFFIXES) + r')\.?$')
+
+# Cheap shape check so malformed dates never reach the exception machinery
+_ISO_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+# Static skeleton of the extraction prompt; only the vendor guidance and
+# invoice text vary per call
+_EXTRACTION_TEMPLATE = """
+        Extract the following information from this invoice text and return it as valid JSON:
+
+        {{
+            "invoice_number": "string or null",
+            "invoice_date": "YYYY-MM-DD format or null",
+            "due_date": "YYYY-MM-DD format or null",
+            "vendor_name": "string or null",
+            "vendor_address": "string or null",
+            "vendor_email": "string or null",
+            "vendor_phone": "string or null",
+            "total_amount": "decimal number or null",
+            "subtotal": "decimal number or null",
+            "tax_amount": "decimal number or null",
+            "currency": "string (default USD)",
+            "description": "string or null",
+            "items": [
+                {{
+                    "description": "string",
+                    "quantity": "number",
+                    "unit_price": "decimal",
+                    "total": "decimal"
+                }}
+            ],
+            "confidence_score": "float between 0.0 and 1.0"
+        }}
+        {vendor_guidance}
+
+        Invoice Text:
+        {text_content}
+
+        CRITICAL EXTRACTION RULES:
+        - ALWAYS extract the vendor_name from the invoice header/top of the document
+        - The vendor_name is typically the first company name, business name, or organization name that appears
+        - Look for company names in the letterhead, header, or first few lines
+        - Common patterns: "COMPANY NAME", "Company Name", "Company Name Inc.", etc.
+        - If multiple company names appear, the vendor is usually the one issuing the invoice (at the top)
+        - Return valid JSON only
+        - Use null for missing information
+        - Ensure dates are in YYYY-MM-DD format
+        - Ensure amounts are decimal numbers
+        - Include confidence score based on text clarity
+        - For vendor_name, use the full official company name (e.g., "Microsoft Corporation" not "Microsoft")
+
+        Examples of vendor extraction:
+        - If text starts with "GARCIA & ASSOCIATES LAW FIRM", vendor_name should be "GARCIA & ASSOCIATES LAW FIRM"
+        - If text starts with "Microsoft Corporation", vendor_name should be "Microsoft Corporation"
+        - If text starts with "MERALCO", vendor_name should be "MERALCO"
+        """
+
+
+class ExtractedInvoiceItem(BaseModel):
+    """Single line item coerced from the OpenAI extraction response"""
+
+    description: str = 'Item'
+    quantity: float = 1
+    unit_price: float = 0
+    total: float = 0
+
+    @field_validator('description', mode='before')
+    @classmethod
+    def _clean_description(cls, value):
+        return str(value).strip() or 'Item' if value is not None else 'Item'
+
+    @field_validator('quantity', mode='before')
+    @classmethod
+    def _clean_quantity(cls, value):
+        return value or 1
+
+    @field_validator('unit_price', 'total', mode='before')
+    @classmethod
+    def _clean_amounts(cls, value):
+        return value or 0
+
+
+class ExtractedInvoice(BaseModel):
+    """
+    Validation/coercion model for OpenAI extraction responses
+
+    Mirrors the old handwritten cleaning rules, but the coercion runs in
+    pydantic-core (Rust) instead of per-field Python loops
+    """
+
+    invoice_number: Optional[str] = None
+    invoice_date: Optional[str] = None
+    due_date: Optional[str] = None
+    vendor_name: Optional[str] = None
+    vendor_address: Optional[str] = None
+    vendor_email: Optional[str] = None
+    vendor_phone: Optional[str] = None
+    total_amount: Optional[float] = None
+    subtotal: Optional[float] = None
+    tax_amount: Optional[float] = None
+    currency: str = 'USD'
+    description: Optional[str] = None
+    items: list[ExtractedInvoiceItem] = []
+    confidence_score: float = 0.5
+
+    @field_validator('invoice_number', 'vendor_name', 'vendor_address',
+                     'vendor_email', 'vendor_phone', 'description', mode='before')
+    @classmethod
+    def _clean_strings(cls, value):
+        if value is None:
+            return None
+        return str(value).strip() or None
+
+    @field_validator('invoice_date', 'due_date', mode='before')
+    @classmethod
+    def _clean_dates(cls, value):
+        if value and isinstance(value, str) and _ISO_DATE_RE.match(value):
+            try:
+                date.fromisoformat(value)
+                return value
+            except ValueError:
+                return None
+        return None
+
+    @field_validator('total_amount', 'subtotal', 'tax_amount', mode='before')
+    @classmethod
+    def _clean_decimals(cls, value):
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except (ValueError, TypeError):
+            return None
+
+    @field_validator('currency', mode='before')
+    @classmethod
+    def _clean_currency(cls, value):
+        if value is None:
+            return 'USD'
+        return str(value).strip() or 'USD'
+
+    @field_validator('items', mode='before')
+    @classmethod
+    def _clean_items(cls, value):
+        if not isinstance(value, list):
+            return []
+        return [item for item in value if isinstance(item, dict)]
+
+    @field_validator('confidence_score', mode='before')
+    @classmethod
+    def _clamp_confidence(cls, value):
+        try:
+            return max(0.0, min(1.0, float(value)))
+        except (ValueError, TypeError):
+            return 0.5
+
+
+@functools.lru_cache(maxsize=8)
+def _format_vendor_guidance(existing_vendors: tuple) -> str:
+    """Pre-join the existing-vendor block for a given vendor set"""
+    vendor_lines = '\n'.join(f'- {vendor}' for vendor in existing_vendors)
+    return f"""
+
+        EXISTING VENDORS (use exact match if possible):
+        {vendor_lines}
+
+        For vendor_name, try to match one of the existing vendors above if the invoice is from them.
+        """
+
 
 class OpenAIService:
     """
     Service class for OpenAI API integration
     """
 
+    _instance = None
+
     def __init__(self):
         """Initialize OpenAI client with API key from settings"""
         if not settings.OPENAI_API_KEY:
@@ -28,11 +230,50 @@ class OpenAIService:
                 "OPENAI_API_KEY is required. Please set it in your .env file."
             )
 
-        self.client = openai.OpenAI(api_key=settings.OPENAI_API_KEY)
+        # Persistent keep-alive pool so repeated API calls reuse TCP/TLS
+        # connections instead of paying a handshake per request. HTTP/2
+        # multiplexes concurrent batch calls over fewer connections, but
+        # needs the optional h2 package, so it is feature-detected.
+        http2 = importlib.util.find_spec('h2') is not None
+        limits = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+        timeout = httpx.Timeout(60.0, connect=10.0)
+        self.client = openai.OpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            http_client=httpx.Client(http2=http2, limits=limits, timeout=timeout)
+        )
+        self.aclient = openai.AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            http_client=httpx.AsyncClient(http2=http2, limits=limits, timeout=timeout)
+        )
         self.model = settings.OPENAI_MODEL
         self.max_tokens = settings.OPENAI_MAX_TOKENS
         self.temperature = settings.OPENAI_TEMPERATURE
 
+    @classmethod
+    def instance(cls) -> 'OpenAIService':
+        """Shared service instance so callers reuse one connection pool"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @_openai_retry
+    def _create_embedding_response(self, text: str):
+        """Embedding request with exponential-backoff retry on transient errors"""
+        return self.client.embeddings.create(
+            model='text-embedding-3-small',
+            input=text
+        )
+
+    @_openai_retry
+    def _create_chat_completion(self, **kwargs):
+        """Chat completion with exponential-backoff retry on transient errors"""
+        return self.client.chat.completions.create(**kwargs)
+
+    @_openai_retry
+    async def _acreate_chat_completion(self, **kwargs):
+        """Async chat completion with exponential-backoff retry on transient errors"""
+        return await self.aclient.chat.completions.create(**kwargs)
+
     def extract_invoice_data(self, text_content: str, existing_vendors: list = None) -> Dict[str, Any]:
         """
         Extract structured data from invoice text using OpenAI
@@ -47,33 +288,20 @@ class OpenAIService:
         try:
             prompt = self._create_extraction_prompt(text_content, existing_vendors)
 
-            logger.info(f"Starting OpenAI extraction for text length: {len(text_content)} chars")
-            logger.debug(f"Text content preview: {text_content[:200]}...")
-
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert invoice data extraction assistant. Extract accurate financial data from invoices and return valid JSON. ALWAYS extract the vendor/company name from the invoice header - this is critical."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                response_format={"type": "json_object"}
+            logger.info("Starting OpenAI extraction for text length: %d chars", len(text_content))
+            logger.debug("Text content preview: %.200s...", text_content)
+
+            response = self._create_chat_completion(
+                **self._extraction_request_kwargs(prompt)
             )
 
             # Log the raw response for debugging
             raw_response = response.choices[0].message.content
-            logger.debug(f"OpenAI raw response: {raw_response}")
+            logger.debug("OpenAI raw response: %s", raw_response)
 
             # Parse the response
-            result = json.loads(raw_response)
-            logger.info(f"Successfully parsed OpenAI response. Vendor extracted: {result.get('vendor_name')}")
+            result = orjson.loads(raw_response)
+            logger.info("Successfully parsed OpenAI response. Vendor extracted: %s", result.get('vendor_name'))
 
             # Validate and clean the extracted data
             cleaned_data = self._validate_and_clean_data(result)
@@ -84,22 +312,114 @@ class OpenAIService:
                 cleaned_data['vendor_name'] = self._normalize_vendor_name(
                     cleaned_data['vendor_name'], existing_vendors
                 )
-                logger.info(f"Vendor normalized: '{original_vendor}' -> '{cleaned_data['vendor_name']}'")
+                logger.info("Vendor normalized: '%s' -> '%s'", original_vendor, cleaned_data['vendor_name'])
 
-            logger.info(f"Successfully extracted invoice data using {self.model}. Final vendor: {cleaned_data.get('vendor_name')}")
+            logger.info("Successfully extracted invoice data using %s. Final vendor: %s", self.model, cleaned_data.get('vendor_name'))
             return cleaned_data
 
         except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse OpenAI response as JSON: {e}")
-            logger.error(f"Raw response was: {response.choices[0].message.content if 'response' in locals() else 'No response'}")
+            logger.error("Failed to parse OpenAI response as JSON: %s", e)
+            logger.error("Raw response was: %s", response.choices[0].message.content if 'response' in locals() else 'No response')
             return self._get_default_response()
 
         except Exception as e:
-            logger.error(f"OpenAI API error: {e}")
+            logger.error("OpenAI API error: %s", e)
             import traceback
-            logger.error(f"Full traceback: {traceback.format_exc()}")
+            logger.error("Full traceback: %s", traceback.format_exc())
+            return self._get_default_response()
+
+
+    async def aextract_invoice_data(self, text_content: str, existing_vendors: list = None) -> Dict[str, Any]:
+        """
+        Async variant of extract_invoice_data for overlapping network latency
+        across a batch of pending tasks
+
+        Args:
+            text_content (str): Raw text extracted from invoice PDF
+            existing_vendors (list): List of existing vendor names for reference
+
+        Returns:
+            Dict[str, Any]: Structured invoice data
+        """
+        try:
+            prompt = self._create_extraction_prompt(text_content, existing_vendors)
+
+            response = await self._acreate_chat_completion(
+                **self._extraction_request_kwargs(prompt)
+            )
+
+            result = orjson.loads(response.choices[0].message.content)
+            cleaned_data = self._validate_and_clean_data(result)
+
+            if existing_vendors and cleaned_data.get('vendor_name'):
+                cleaned_data['vendor_name'] = self._normalize_vendor_name(
+                    cleaned_data['vendor_name'], existing_vendors
+                )
+
+            return cleaned_data
+
+        except json.JSONDecodeError as e:
+            logger.error("Failed to parse OpenAI response as JSON: %s", e)
+            return self._get_default_response()
+
+        except Exception as e:
+            logger.error("OpenAI API error: %s", e)
             return self._get_default_response()
 
+    def extract_invoice_data_batch(self, text_contents: list, existing_vendors: list = None,
+                                   concurrency: int = 5) -> list:
+        """
+        Extract data for a batch of invoices concurrently
+
+        The OpenAI calls are pure I/O, so running them as coroutines under a
+        semaphore collapses wall-clock time from sum(RTT) to roughly max(RTT).
+
+        Args:
+            text_contents (list): Raw text for each invoice in the batch
+            existing_vendors (list): List of existing vendor names for reference
+            concurrency (int): Maximum number of in-flight API requests
+
+        Returns:
+            list: Structured invoice data dicts, in input order
+        """
+        async def _run_batch():
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def _extract_one(text_content):
+                async with semaphore:
+                    return await self.aextract_invoice_data(text_content, existing_vendors)
+
+            return await asyncio.gather(
+                *[_extract_one(text) for text in text_contents],
+                return_exceptions=True
+            )
+
+        results = asyncio.run(_run_batch())
+        return [
+            result if not isinstance(result, Exception) else self._get_default_response()
+            for result in results
+        ]
+
+    def create_embedding(self, text: str) -> list:
+        """
+        Compute an embedding vector for similarity checks
+
+        Embeddings are orders of magnitude cheaper than chat completions,
+        so local cosine-similarity comparisons can replace most LLM-based
+        duplicate checks.
+
+        Args:
+            text (str): Text to embed
+
+        Returns:
+            list: Embedding vector, empty on failure
+        """
+        try:
+            response = self._create_embedding_response(text)
+            return response.data[0].embedding
+        except Exception as e:
+            logger.error("Failed to create embedding: %s", e)
+            return []
 
     def detect_duplicates(self, new_invoice_data: Dict[str, Any], existing_invoices: list) -> Dict[str, Any]:
         """
@@ -113,7 +433,102 @@ class OpenAIService:
             Dict[str, Any]: Duplicate detection results
         """
         try:
-            prompt = f"""
+            response = self._create_chat_completion(
+                **self._duplicate_request_kwargs(new_invoice_data, existing_invoices)
+            )
+
+            result = orjson.loads(response.choices[0].message.content)
+            logger.info("Duplicate detection completed with confidence: %s", result.get('confidence', 0))
+            return result
+
+        except Exception as e:
+            logger.error("Failed to detect duplicates: %s", e)
+            return self._default_duplicate_response()
+
+    async def adetect_duplicates(self, new_invoice_data: Dict[str, Any], existing_invoices: list) -> Dict[str, Any]:
+        """
+        Async variant of detect_duplicates
+
+        Args:
+            new_invoice_data (Dict): New invoice data
+            existing_invoices (list): List of existing invoice data
+
+        Returns:
+            Dict[str, Any]: Duplicate detection results
+        """
+        try:
+            response = await self._acreate_chat_completion(
+                **self._duplicate_request_kwargs(new_invoice_data, existing_invoices)
+            )
+
+            result = orjson.loads(response.choices[0].message.content)
+            logger.info("Duplicate detection completed with confidence: %s", result.get('confidence', 0))
+            return result
+
+        except Exception as e:
+            logger.error("Failed to detect duplicates: %s", e)
+            return self._default_duplicate_response()
+
+    def _extraction_request_kwargs(self, prompt: str) -> Dict[str, Any]:
+        """Build the chat-completion request for invoice data extraction.
+        Shared by the sync, async and Batch API paths."""
+        return {
+            'model': self.model,
+            'messages': [
+                {
+                    "role": "system",
+                    "content": "You are an expert invoice data extraction assistant. Extract accurate financial data from invoices and return valid JSON. ALWAYS extract the vendor/company name from the invoice header - this is critical."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            'max_tokens': self.max_tokens,
+            'temperature': self.temperature,
+            'response_format': {"type": "json_object"}
+        }
+
+    def build_extraction_batch_line(self, custom_id: str, text_content: str,
+                                    existing_vendors: list = None) -> Dict[str, Any]:
+        """
+        Build one Batch API JSONL entry for an extraction request
+
+        Args:
+            custom_id (str): Caller-side identifier echoed back in the output
+            text_content (str): Raw text extracted from invoice PDF
+            existing_vendors (list): List of existing vendor names for reference
+
+        Returns:
+            Dict[str, Any]: JSONL line ready for orjson.dumps
+        """
+        prompt = self._create_extraction_prompt(text_content, existing_vendors)
+        return {
+            'custom_id': custom_id,
+            'method': 'POST',
+            'url': '/v1/chat/completions',
+            'body': self._extraction_request_kwargs(prompt)
+        }
+
+    def clean_batch_extraction_result(self, raw_content: str, existing_vendors: list = None) -> Dict[str, Any]:
+        """Validate and normalize one Batch API extraction response body"""
+        try:
+            cleaned_data = self._validate_and_clean_data(orjson.loads(raw_content))
+        except Exception as e:
+            # Degrade to the default response like the realtime paths do -
+            # one malformed LLM row must not abort the whole batch collection
+            logger.error("Failed to clean batch extraction response: %s", e)
+            return self._get_default_response()
+
+        if existing_vendors and cleaned_data.get('vendor_name'):
+            cleaned_data['vendor_name'] = self._normalize_vendor_name(
+                cleaned_data['vendor_name'], existing_vendors
+            )
+        return cleaned_data
+
+    def _duplicate_request_kwargs(self, new_invoice_data: Dict[str, Any], existing_invoices: list) -> Dict[str, Any]:
+        """Build the chat-completion request for duplicate detection"""
+        prompt = f"""
             Analyze if this new invoice is a duplicate of any existing invoices.
 
             New Invoice:
@@ -123,7 +538,7 @@ class OpenAIService:
             - Invoice Number: {new_invoice_data.get('invoice_number', 'N/A')}
 
             Existing Invoices:
-            {json.dumps(existing_invoices, indent=2)}
+            {orjson.dumps(existing_invoices).decode()}
 
             Return JSON with:
             {{
@@ -134,161 +549,47 @@ class OpenAIService:
             }}
             """
 
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert at detecting duplicate invoices. Return valid JSON."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=200,
-                temperature=0.1,
-                response_format={"type": "json_object"}
-            )
-
-            result = json.loads(response.choices[0].message.content)
-            logger.info(f"Duplicate detection completed with confidence: {result.get('confidence', 0)}")
-            return result
-
-        except Exception as e:
-            logger.error(f"Failed to detect duplicates: {e}")
-            return {
-                "is_duplicate": False,
-                "confidence": 0.0,
-                "matching_invoice_id": None,
-                "reason": "Analysis failed"
-            }
+        return {
+            'model': self.model,
+            'messages': [
+                {
+                    "role": "system",
+                    "content": "You are an expert at detecting duplicate invoices. Return valid JSON."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            'max_tokens': 200,
+            'temperature': 0.1,
+            'response_format': {"type": "json_object"}
+        }
+
+    @staticmethod
+    def _default_duplicate_response() -> Dict[str, Any]:
+        """Return default response when duplicate detection fails"""
+        return {
+            "is_duplicate": False,
+            "confidence": 0.0,
+            "matching_invoice_id": None,
+            "reason": "Analysis failed"
+        }
 
     def _create_extraction_prompt(self, text_content: str, existing_vendors: list = None) -> str:
         """Create a structured prompt for invoice data extraction"""
-        vendor_guidance = ""
-        if existing_vendors:
-            vendor_guidance = f"""
-
-        EXISTING VENDORS (use exact match if possible):
-        {chr(10).join([f'- {vendor}' for vendor in existing_vendors[:20]])}
-
-        For vendor_name, try to match one of the existing vendors above if the invoice is from them.
-        """
-
-        return f"""
-        Extract the following information from this invoice text and return it as valid JSON:
-
-        {{
-            "invoice_number": "string or null",
-            "invoice_date": "YYYY-MM-DD format or null",
-            "due_date": "YYYY-MM-DD format or null",
-            "vendor_name": "string or null",
-            "vendor_address": "string or null",
-            "vendor_email": "string or null",
-            "vendor_phone": "string or null",
-            "total_amount": "decimal number or null",
-            "subtotal": "decimal number or null",
-            "tax_amount": "decimal number or null",
-            "currency": "string (default USD)",
-            "description": "string or null",
-            "items": [
-                {{
-                    "description": "string",
-                    "quantity": "number",
-                    "unit_price": "decimal",
-                    "total": "decimal"
-                }}
-            ],
-            "confidence_score": "float between 0.0 and 1.0"
-        }}
-        {vendor_guidance}
-
-        Invoice Text:
-        {text_content}
-
-        CRITICAL EXTRACTION RULES:
-        - ALWAYS extract the vendor_name from the invoice header/top of the document
-        - The vendor_name is typically the first company name, business name, or organization name that appears
-        - Look for company names in the letterhead, header, or first few lines
-        - Common patterns: "COMPANY NAME", "Company Name", "Company Name Inc.", etc.
-        - If multiple company names appear, the vendor is usually the one issuing the invoice (at the top)
-        - Return valid JSON only
-        - Use null for missing information
-        - Ensure dates are in YYYY-MM-DD format
-        - Ensure amounts are decimal numbers
-        - Include confidence score based on text clarity
-        - For vendor_name, use the full official company name (e.g., "Microsoft Corporation" not "Microsoft")
-
-        Examples of vendor extraction:
-        - If text starts with "GARCIA & ASSOCIATES LAW FIRM", vendor_name should be "GARCIA & ASSOCIATES LAW FIRM"
-        - If text starts with "Microsoft Corporation", vendor_name should be "Microsoft Corporation"
-        - If text starts with "MERALCO", vendor_name should be "MERALCO"
-        """
+        vendor_guidance = (
+            _format_vendor_guidance(tuple(existing_vendors[:20]))
+            if existing_vendors else ''
+        )
+        return _EXTRACTION_TEMPLATE.format(
+            vendor_guidance=vendor_guidance,
+            text_content=text_content
+        )
 
     def _validate_and_clean_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Validate and clean extracted data"""
-        cleaned = {}
-
-        # String fields
-        string_fields = ['invoice_number', 'vendor_name', 'vendor_address',
-                        'vendor_email', 'vendor_phone', 'description', 'currency']
-        for field in string_fields:
-            value = data.get(field)
-            cleaned[field] = str(value).strip() if value and str(value).strip() else None
-
-        # Date fields
-        date_fields = ['invoice_date', 'due_date']
-        for field in date_fields:
-            value = data.get(field)
-            if value:
-                try:
-                    # Validate date format
-                    datetime.strptime(value, '%Y-%m-%d')
-                    cleaned[field] = value
-                except ValueError:
-                    cleaned[field] = None
-            else:
-                cleaned[field] = None
-
-        # Decimal fields
-        decimal_fields = ['total_amount', 'subtotal', 'tax_amount']
-        for field in decimal_fields:
-            value = data.get(field)
-            if value is not None:
-                try:
-                    cleaned[field] = float(value)
-                except (ValueError, TypeError):
-                    cleaned[field] = None
-            else:
-                cleaned[field] = None
-
-        # Currency default
-        cleaned['currency'] = cleaned.get('currency') or 'USD'
-
-        # Items array
-        items = data.get('items', [])
-        cleaned_items = []
-        if isinstance(items, list):
-            for item in items:
-                if isinstance(item, dict):
-                    cleaned_item = {
-                        'description': str(item.get('description', '')).strip() or 'Item',
-                        'quantity': float(item.get('quantity', 1)) if item.get('quantity') else 1,
-                        'unit_price': float(item.get('unit_price', 0)) if item.get('unit_price') else 0,
-                        'total': float(item.get('total', 0)) if item.get('total') else 0
-                    }
-                    cleaned_items.append(cleaned_item)
-        cleaned['items'] = cleaned_items
-
-        # Confidence score
-        confidence = data.get('confidence_score', 0.5)
-        try:
-            cleaned['confidence_score'] = max(0.0, min(1.0, float(confidence)))
-        except (ValueError, TypeError):
-            cleaned['confidence_score'] = 0.5
-
-        return cleaned
+        return ExtractedInvoice.model_validate(data).model_dump()
 
     def _normalize_vendor_name(self, extracted_vendor: str, existing_vendors: list) -> str:
         """
@@ -305,44 +606,50 @@ class OpenAIService:
             return extracted_vendor
 
         extracted_lower = extracted_vendor.lower().strip()
+        lower_map, clean_map, lower_keys = self._build_vendor_lookup(tuple(existing_vendors))
 
-        # Exact match first
-        for vendor in existing_vendors:
-            if vendor.lower() == extracted_lower:
-                return vendor
+        # Exact match first - O(1) dict lookup
+        exact = lower_map.get(extracted_lower)
+        if exact:
+            return exact
 
-        # Partial match - check if extracted name is contained in existing or vice versa
-        for vendor in existing_vendors:
-            vendor_lower = vendor.lower()
-            # Check if the extracted name contains the existing vendor name or vice versa
-            if (extracted_lower in vendor_lower and len(extracted_lower) > 3) or \
-               (vendor_lower in extracted_lower and len(vendor_lower) > 3):
-                return vendor
+        # Fuzzy match via rapidfuzz (C++-level scoring) covers substring
+        # containment and near-misses like "Microsft Corp" in one pass
+        best = fuzz_process.extractOne(
+            extracted_lower, lower_keys, scorer=fuzz.WRatio, score_cutoff=85
+        )
+        if best:
+            return lower_map[best[0]]
 
         # Check for common company suffixes and abbreviations
-        extracted_clean = self._clean_company_name(extracted_lower)
-        for vendor in existing_vendors:
-            vendor_clean = self._clean_company_name(vendor.lower())
-            if extracted_clean == vendor_clean:
-                return vendor
+        cleaned = clean_map.get(self._clean_company_name(extracted_lower))
+        if cleaned:
+            return cleaned
 
         # No match found, return original
         return extracted_vendor
 
-    def _clean_company_name(self, name: str) -> str:
-        """Clean company name by removing common suffixes and normalizing"""
-        suffixes = [
-            'inc', 'inc.', 'corporation', 'corp', 'corp.', 'llc', 'ltd', 'ltd.',
-            'limited', 'co', 'co.', 'company', 'technologies', 'tech', 'systems'
-        ]
-
-        name = name.strip().lower()
-        for suffix in suffixes:
-            if name.endswith(f' {suffix}'):
-                name = name[:-len(suffix)-1].strip()
-                break
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _build_vendor_lookup(existing_vendors: tuple) -> tuple:
+        """
+        Precompute lookup tables for a vendor list so repeated normalization
+        calls don't re-lower and re-clean every candidate
 
-        return name
+        Returns:
+            tuple: (lower_map, clean_map, lower_keys)
+        """
+        lower_map = {vendor.lower(): vendor for vendor in existing_vendors}
+        clean_map = {
+            OpenAIService._clean_company_name(vendor.lower()): vendor
+            for vendor in existing_vendors
+        }
+        return lower_map, clean_map, list(lower_map)
+
+    @staticmethod
+    def _clean_company_name(name: str) -> str:
+        """Clean company name by removing common suffixes and normalizing"""
+        return _SUFFIX_RE.sub('', name.strip().lower()).strip()
 
     def _get_default_response(self) -> Dict[str, Any]:
         """Return default response when extraction fails"""
@@ -6,10 +6,10 @@ class AIProcessingTaskSerializer(serializers.ModelSerializer):
     """
     Serializer for AIProcessingTask model
     """
-    task_type_display = serializers.CharField(source='get_task_type_display', read_only=True)
-    status_display = serializers.CharField(source='get_status_display', read_only=True)
+    task_type_display = serializers.CharField(source='task_type_display_db', read_only=True)
+    status_display = serializers.CharField(source='status_display_db', read_only=True)
     invoice_number = serializers.CharField(source='invoice.invoice_number', read_only=True)
-    processing_duration_seconds = serializers.SerializerMethodField()
+    processing_duration_seconds = serializers.FloatField(read_only=True)
 
     class Meta:
         model = AIProcessingTask
@@ -25,14 +25,6 @@ class AIProcessingTaskSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
 
-    def get_processing_duration_seconds(self, obj):
-        """
-        Convert processing duration from milliseconds to seconds
-        """
-        if obj.processing_duration_ms:
-            return round(obj.processing_duration_ms / 1000, 2)
-        return None
-
 
 class AIProcessingTaskCreateSerializer(serializers.ModelSerializer):
     """
@@ -49,37 +41,25 @@ class AIProcessingTaskCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class AIProcessingTaskListSerializer(serializers.ModelSerializer):
+class AIProcessingTaskListSerializer(serializers.Serializer):
     """
     Lightweight serializer for AI processing task list views
-    """
-    task_type_display = serializers.CharField(source='get_task_type_display', read_only=True)
-    status_display = serializers.CharField(source='get_status_display', read_only=True)
-    invoice_number = serializers.CharField(source='invoice.invoice_number', read_only=True)
 
-    class Meta:
-        model = AIProcessingTask
-        fields = [
-            'id', 'invoice', 'invoice_number', 'task_type', 'task_type_display',
-            'status', 'status_display', 'confidence_score', 'retry_count',
-            'started_at', 'completed_at', 'created_at'
-        ]
-
-
-class AIProcessingStatsSerializer(serializers.Serializer):
-    """
-    Serializer for AI processing statistics
+    Fed by AIProcessingTaskQuerySet.as_list_values() dicts, so no model
+    instances are built for list responses
     """
-    total_tasks = serializers.IntegerField()
-    completed_tasks = serializers.IntegerField()
-    failed_tasks = serializers.IntegerField()
-    pending_tasks = serializers.IntegerField()
-    processing_tasks = serializers.IntegerField()
-    avg_confidence_score = serializers.FloatField()
-    avg_processing_time_ms = serializers.FloatField()
-    success_rate = serializers.FloatField()
-    task_type_breakdown = serializers.DictField()
-    recent_tasks = serializers.ListField()
+    id = serializers.IntegerField(read_only=True)
+    invoice = serializers.IntegerField(read_only=True)
+    invoice_number = serializers.CharField(read_only=True)
+    task_type = serializers.CharField(read_only=True)
+    task_type_display = serializers.CharField(read_only=True)
+    status = serializers.CharField(read_only=True)
+    status_display = serializers.CharField(read_only=True)
+    confidence_score = serializers.FloatField(read_only=True)
+    retry_count = serializers.IntegerField(read_only=True)
+    started_at = serializers.DateTimeField(read_only=True)
+    completed_at = serializers.DateTimeField(read_only=True)
+    created_at = serializers.DateTimeField(read_only=True)
 
 
 class AIProcessingResultSerializer(serializers.Serializer):
@@ -3,11 +3,18 @@ AI Task Processor
 Handles processing of AI tasks using OpenAI service
 """
 
+import asyncio
+import json
 import logging
+import math
 import time
-from datetime import datetime
+import uuid
+from datetime import date
 from typing import Dict, Any, Optional
 
+from asgiref.sync import sync_to_async
+from rapidfuzz import fuzz, process as fuzz_process
+from django.db import connection, transaction
 from django.utils import timezone
 from django.conf import settings
 
@@ -23,9 +30,51 @@ class AITaskProcessor:
     Processes AI tasks using OpenAI service
     """
 
-    def __init__(self):
-        """Initialize the task processor"""
-        self.openai_service = OpenAIService()
+    # Everything a task handler may have touched by completion time
+    COMPLETION_FIELDS = [
+        'status', 'completed_at', 'processing_duration_ms', 'output_data',
+        'confidence_score', 'error_message', 'updated_at'
+    ]
+
+    # Embedding cosine-similarity thresholds for duplicate detection.
+    # Above the first we call it a duplicate, below the second we call it
+    # clean; only the ambiguous band in between goes to the chat model.
+    DUPLICATE_SIMILARITY = 0.92
+    CLEAR_SIMILARITY = 0.80
+
+    def __init__(self, existing_vendors: Optional[list] = None):
+        """
+        Initialize the task processor
+
+        Args:
+            existing_vendors (list, optional): Vendor names fetched once by
+                the batch driver, so a batch of K tasks issues one vendor
+                query instead of K full-table scans
+        """
+        self.openai_service = OpenAIService.instance()
+        self._existing_vendor_names = existing_vendors
+        self._vendor_cache = None
+
+    def _get_vendor_cache(self) -> Dict[str, 'Vendor']:
+        """Lazily load all vendors once per processor, keyed by lowered name.
+
+        Vendor resolution then runs against memory instead of issuing up to
+        three queries (plus one per reverse-partial candidate) per invoice."""
+        if self._vendor_cache is None:
+            from invoices.models import Vendor
+            self._vendor_cache = {
+                vendor.name.lower(): vendor for vendor in Vendor.objects.all()
+            }
+        return self._vendor_cache
+
+    def _get_existing_vendor_names(self) -> list:
+        """Vendor names for extraction prompts, fetched at most once per processor"""
+        if self._existing_vendor_names is None:
+            from invoices.models import Vendor
+            self._existing_vendor_names = list(
+                Vendor.objects.values_list('name', flat=True)
+            )
+        return self._existing_vendor_names
 
     def process_task(self, task: AIProcessingTask) -> bool:
         """
@@ -37,13 +86,18 @@ class AITaskProcessor:
         Returns:
             bool: True if successful, False otherwise
         """
-        logger.info(f"Processing task {task.id}: {task.task_type} for invoice {task.invoice.id}")
+        logger.info("Processing task %s: %s for invoice %s", task.id, task.task_type, task.invoice.id)
 
-        # Update task status
+        # Update task status - pinpoint UPDATE, no full-row write
         task.status = 'processing'
         task.started_at = timezone.now()
         task.ai_model_version = settings.OPENAI_MODEL
-        task.save()
+        AIProcessingTask.objects.filter(pk=task.pk).update(
+            status=task.status,
+            started_at=task.started_at,
+            ai_model_version=task.ai_model_version,
+            updated_at=timezone.now()
+        )
 
         start_time = time.time()
 
@@ -54,7 +108,7 @@ class AITaskProcessor:
             elif task.task_type == 'duplicate_detection':
                 success = self._process_duplicate_detection(task)
             else:
-                logger.error(f"Unknown task type: {task.task_type}")
+                logger.error("Unknown task type: %s", task.task_type)
                 success = False
 
             # Calculate processing duration
@@ -67,20 +121,152 @@ class AITaskProcessor:
 
             if success:
                 task.status = 'completed'
-                logger.info(f"Task {task.id} completed successfully in {duration_ms}ms")
+                logger.info("Task %s completed successfully in %sms", task.id, duration_ms)
             else:
                 task.status = 'failed'
-                logger.error(f"Task {task.id} failed after {duration_ms}ms")
+                logger.error("Task %s failed after %sms", task.id, duration_ms)
 
-            task.save()
+            task.save(update_fields=self.COMPLETION_FIELDS)
             return success
 
         except Exception as e:
-            logger.error(f"Error processing task {task.id}: {e}")
+            logger.error("Error processing task %s: %s", task.id, e)
             task.status = 'failed'
             task.error_message = str(e)
             task.completed_at = timezone.now()
-            task.save()
+            task.save(update_fields=['status', 'error_message', 'completed_at', 'updated_at'])
+            return False
+
+    async def aprocess_task(self, task: AIProcessingTask) -> bool:
+        """
+        Async variant of process_task
+
+        OpenAI round-trips are awaited on the async client so a batch of
+        tasks can overlap network latency; ORM writes go through
+        sync_to_async so they never block the event loop.
+
+        Args:
+            task (AIProcessingTask): The task to process
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        logger.info("Processing task %s: %s for invoice %s", task.id, task.task_type, task.invoice.id)
+
+        task.status = 'processing'
+        task.started_at = timezone.now()
+        task.ai_model_version = settings.OPENAI_MODEL
+        await sync_to_async(
+            AIProcessingTask.objects.filter(pk=task.pk).update
+        )(
+            status=task.status,
+            started_at=task.started_at,
+            ai_model_version=task.ai_model_version,
+            updated_at=timezone.now()
+        )
+
+        start_time = time.time()
+
+        try:
+            if task.task_type == 'data_extraction':
+                success = await self._aprocess_data_extraction(task)
+            elif task.task_type == 'duplicate_detection':
+                success = await self._aprocess_duplicate_detection(task)
+            else:
+                logger.error("Unknown task type: %s", task.task_type)
+                success = False
+
+            duration_ms = int((time.time() - start_time) * 1000)
+
+            task.completed_at = timezone.now()
+            task.processing_duration_ms = duration_ms
+
+            if success:
+                task.status = 'completed'
+                logger.info("Task %s completed successfully in %sms", task.id, duration_ms)
+            else:
+                task.status = 'failed'
+                logger.error("Task %s failed after %sms", task.id, duration_ms)
+
+            await sync_to_async(task.save)(update_fields=self.COMPLETION_FIELDS)
+            return success
+
+        except Exception as e:
+            logger.error("Error processing task %s: %s", task.id, e)
+            task.status = 'failed'
+            task.error_message = str(e)
+            task.completed_at = timezone.now()
+            await sync_to_async(task.save)(
+                update_fields=['status', 'error_message', 'completed_at', 'updated_at']
+            )
+            return False
+
+    async def _aprocess_data_extraction(self, task: AIProcessingTask) -> bool:
+        """Async variant of _process_data_extraction"""
+        try:
+            invoice = task.invoice
+
+            text_content = await self._aextract_text_from_invoice(invoice)
+
+            if not text_content:
+                task.error_message = "No text content found in invoice file"
+                return False
+
+            existing_vendors = await sync_to_async(self._get_existing_vendor_names)()
+
+            extracted_data = await self.openai_service.aextract_invoice_data(
+                text_content, existing_vendors=existing_vendors
+            )
+
+            task.output_data = extracted_data
+            task.confidence_score = extracted_data.get('confidence_score', 0.0)
+
+            await sync_to_async(self._update_invoice_with_extracted_data)(invoice, extracted_data)
+
+            return True
+
+        except Exception as e:
+            task.error_message = f"Data extraction failed: {e}"
+            return False
+
+    async def _aprocess_duplicate_detection(self, task: AIProcessingTask) -> bool:
+        """Async variant of _process_duplicate_detection"""
+        try:
+            invoice = task.invoice
+
+            # Local embedding comparison first; the chat model only sees
+            # the ambiguous similarity band
+            duplicate_result, similar_ids = await sync_to_async(
+                self._detect_duplicates_locally
+            )(invoice)
+
+            if duplicate_result is None:
+                recent_invoices = await sync_to_async(self._get_recent_invoices_for_comparison)(
+                    invoice, candidate_ids=similar_ids
+                )
+
+                invoice_data = {
+                    'vendor_name': getattr(invoice.vendor, 'name', '') if invoice.vendor else '',
+                    'total_amount': float(invoice.total_amount) if invoice.total_amount else 0,
+                    'invoice_date': invoice.invoice_date.isoformat() if invoice.invoice_date else None,
+                    'invoice_number': invoice.invoice_number or ''
+                }
+
+                duplicate_result = await self.openai_service.adetect_duplicates(
+                    new_invoice_data=invoice_data,
+                    existing_invoices=recent_invoices
+                )
+
+            task.output_data = duplicate_result
+            task.confidence_score = duplicate_result.get('confidence', 0.0)
+
+            if duplicate_result.get('is_duplicate'):
+                logger.warning("Potential duplicate detected for invoice %s: %s", invoice.id, duplicate_result['reason'])
+
+            return True
+
+        except Exception as e:
+            task.error_message = f"Duplicate detection failed: {e}"
             return False
 
     def _process_data_extraction(self, task: AIProcessingTask) -> bool:
@@ -95,9 +281,8 @@ class AITaskProcessor:
                 task.error_message = "No text content found in invoice file"
                 return False
 
-            # Get existing vendors for better matching
-            from invoices.models import Vendor
-            existing_vendors = list(Vendor.objects.values_list('name', flat=True))
+            # Get existing vendors for better matching (one fetch per batch)
+            existing_vendors = self._get_existing_vendor_names()
 
             # Extract data using OpenAI with vendor context
             extracted_data = self.openai_service.extract_invoice_data(
@@ -123,22 +308,29 @@ class AITaskProcessor:
         try:
             invoice = task.invoice
 
-            # Get recent invoices for comparison
-            recent_invoices = self._get_recent_invoices_for_comparison(invoice)
-
-            # Prepare invoice data for comparison
-            invoice_data = {
-                'vendor_name': getattr(invoice.vendor, 'name', '') if invoice.vendor else '',
-                'total_amount': float(invoice.total_amount) if invoice.total_amount else 0,
-                'invoice_date': invoice.invoice_date.isoformat() if invoice.invoice_date else None,
-                'invoice_number': invoice.invoice_number or ''
-            }
-
-            # Detect duplicates using OpenAI
-            duplicate_result = self.openai_service.detect_duplicates(
-                new_invoice_data=invoice_data,
-                existing_invoices=recent_invoices
-            )
+            # Local embedding comparison first; the chat model only sees
+            # the ambiguous similarity band
+            duplicate_result, similar_ids = self._detect_duplicates_locally(invoice)
+
+            if duplicate_result is None:
+                # Get recent invoices for comparison
+                recent_invoices = self._get_recent_invoices_for_comparison(
+                    invoice, candidate_ids=similar_ids
+                )
+
+                # Prepare invoice data for comparison
+                invoice_data = {
+                    'vendor_name': getattr(invoice.vendor, 'name', '') if invoice.vendor else '',
+                    'total_amount': float(invoice.total_amount) if invoice.total_amount else 0,
+                    'invoice_date': invoice.invoice_date.isoformat() if invoice.invoice_date else None,
+                    'invoice_number': invoice.invoice_number or ''
+                }
+
+                # Detect duplicates using OpenAI
+                duplicate_result = self.openai_service.detect_duplicates(
+                    new_invoice_data=invoice_data,
+                    existing_invoices=recent_invoices
+                )
 
             # Update task output
             task.output_data = duplicate_result
@@ -146,7 +338,7 @@ class AITaskProcessor:
 
             # Log potential duplicates
             if duplicate_result.get('is_duplicate'):
-                logger.warning(f"Potential duplicate detected for invoice {invoice.id}: {duplicate_result['reason']}")
+                logger.warning("Potential duplicate detected for invoice %s: %s", invoice.id, duplicate_result['reason'])
 
             return True
 
@@ -154,6 +346,111 @@ class AITaskProcessor:
             task.error_message = f"Duplicate detection failed: {e}"
             return False
 
+    def _detect_duplicates_locally(self, invoice: Invoice) -> tuple:
+        """
+        Resolve duplicate detection with exact rules and embedding similarity
+
+        Embeddings cost a fraction of a chat completion and the cosine
+        comparison runs in-process, so most invoices never need an LLM
+        round-trip. Returns (result, similar_ids): result is a dict shaped
+        like detect_duplicates() output, or None when similarity lands in
+        the ambiguous band and the chat model should arbitrate - in which
+        case similar_ids holds the top-3 most similar invoice ids so the
+        fallback prompt only carries the candidates that actually matter.
+        """
+        try:
+            from datetime import timedelta
+
+            # Exact invoice number + amount match is a duplicate, no model needed
+            if invoice.invoice_number and invoice.total_amount:
+                exact_match = Invoice.objects.filter(
+                    user=invoice.user,
+                    invoice_number=invoice.invoice_number,
+                    total_amount=invoice.total_amount
+                ).exclude(id=invoice.id).only('id').first()
+                if exact_match:
+                    return {
+                        'is_duplicate': True,
+                        'confidence': 1.0,
+                        'matching_invoice_id': exact_match.id,
+                        'reason': 'Exact invoice number and total amount match'
+                    }, []
+
+            embedding = self._ensure_invoice_embedding(invoice)
+            if not embedding:
+                return None, []
+
+            cutoff_date = timezone.now().date() - timedelta(days=30)
+            candidates = Invoice.objects.filter(
+                user=invoice.user,
+                created_at__date__gte=cutoff_date
+            ).exclude(id=invoice.id)[:50]
+
+            scored = []
+            for candidate in candidates:
+                candidate_embedding = self._ensure_invoice_embedding(candidate)
+                if not candidate_embedding:
+                    continue
+                scored.append((
+                    self._cosine_similarity(embedding, candidate_embedding),
+                    candidate.id
+                ))
+
+            scored.sort(reverse=True)
+            best_similarity, best_id = scored[0] if scored else (0.0, None)
+
+            if best_similarity >= self.DUPLICATE_SIMILARITY:
+                return {
+                    'is_duplicate': True,
+                    'confidence': round(best_similarity, 3),
+                    'matching_invoice_id': best_id,
+                    'reason': f'Embedding similarity {best_similarity:.3f} with invoice {best_id}'
+                }, []
+
+            if best_similarity <= self.CLEAR_SIMILARITY:
+                return {
+                    'is_duplicate': False,
+                    'confidence': round(1.0 - best_similarity, 3),
+                    'matching_invoice_id': None,
+                    'reason': 'No similar recent invoice found'
+                }, []
+
+            # Ambiguous - let the chat model decide over the top candidates
+            return None, [candidate_id for _, candidate_id in scored[:3]]
+
+        except Exception as e:
+            logger.error("Local duplicate detection failed for invoice %s: %s", invoice.id, e)
+            return None, []
+
+    def _ensure_invoice_embedding(self, invoice: Invoice) -> list:
+        """Return the invoice's fingerprint embedding, computing it once if missing"""
+        if invoice.embedding:
+            return invoice.embedding
+
+        fingerprint = ' | '.join([
+            getattr(invoice.vendor, 'name', '') if invoice.vendor else '',
+            invoice.invoice_number or '',
+            str(invoice.total_amount or ''),
+            invoice.invoice_date.isoformat() if invoice.invoice_date else ''
+        ])
+        embedding = self.openai_service.create_embedding(fingerprint)
+        if embedding:
+            invoice.embedding = embedding
+            invoice.save(update_fields=['embedding', 'updated_at'])
+        return embedding
+
+    @staticmethod
+    def _cosine_similarity(a: list, b: list) -> float:
+        """Cosine similarity between two equal-length vectors"""
+        if len(a) != len(b):
+            return 0.0
+        dot = sum(x * y for x, y in zip(a, b))
+        norm_a = math.sqrt(sum(x * x for x in a))
+        norm_b = math.sqrt(sum(y * y for y in b))
+        if not norm_a or not norm_b:
+            return 0.0
+        return dot / (norm_a * norm_b)
+
     def _extract_text_from_invoice(self, invoice: Invoice) -> str:
         """
         Extract text content from invoice file using the file processor
@@ -168,7 +465,7 @@ class AITaskProcessor:
                 if result.get('success'):
                     return result.get('text', '')
                 else:
-                    logger.error(f"Text extraction failed for invoice {invoice.id}: {result.get('error')}")
+                    logger.error("Text extraction failed for invoice %s: %s", invoice.id, result.get('error'))
 
             # Fallback: return basic info if no file or extraction failed
             return f"""
@@ -181,65 +478,92 @@ class AITaskProcessor:
             """
 
         except Exception as e:
-            logger.error(f"Error extracting text from invoice {invoice.id}: {e}")
+            logger.error("Error extracting text from invoice %s: %s", invoice.id, e)
             return f"Error extracting text: {str(e)}"
 
+    async def _aextract_text_from_invoice(self, invoice: Invoice) -> str:
+        """
+        Async wrapper around _extract_text_from_invoice
+
+        File reads and PDF/OCR parsing are I/O- and CPU-bound with no ORM
+        access, so they run with thread_sensitive=False: each extraction
+        gets its own executor thread and a batch of tasks reads files in
+        parallel instead of queueing on sync_to_async's single shared
+        thread.
+        """
+        return await sync_to_async(
+            self._extract_text_from_invoice, thread_sensitive=False
+        )(invoice)
+
     def _update_invoice_with_extracted_data(self, invoice: Invoice, data: Dict[str, Any]) -> None:
         """Update invoice with extracted data"""
         try:
             from invoices.models import Vendor
 
-            logger.info(f"Updating invoice {invoice.id} with extracted data")
-            logger.debug(f"Extracted data keys: {list(data.keys())}")
-            logger.debug(f"Vendor name from data: '{data.get('vendor_name')}'")
-            logger.debug(f"Current invoice vendor: {invoice.vendor}")
+            logger.info("Updating invoice %s with extracted data", invoice.id)
+            logger.debug("Extracted data keys: %s", list(data.keys()))
+            logger.debug("Vendor name from data: '%s'", data.get('vendor_name'))
+            logger.debug("Current invoice vendor: %s", invoice.vendor)
+
+            # Track touched fields so the final save is a narrow UPDATE
+            changed = {'updated_at'}
 
             # Handle vendor creation/assignment
             if data.get('vendor_name') and not invoice.vendor:
                 vendor_name = data['vendor_name'].strip()
-                logger.info(f"Processing vendor assignment for: '{vendor_name}'")
+                logger.info("Processing vendor assignment for: '%s'", vendor_name)
                 if vendor_name:
                     # Try to find existing vendor first
                     vendor = self._find_or_create_vendor(vendor_name, data)
                     invoice.vendor = vendor
-                    logger.info(f"Successfully assigned vendor '{vendor.name}' (ID: {vendor.id}) to invoice {invoice.id}")
+                    changed.add('vendor')
+                    logger.info("Successfully assigned vendor '%s' (ID: %s) to invoice %s", vendor.name, vendor.id, invoice.id)
                 else:
-                    logger.warning(f"Vendor name is empty after stripping for invoice {invoice.id}")
+                    logger.warning("Vendor name is empty after stripping for invoice %s", invoice.id)
             elif not data.get('vendor_name'):
-                logger.warning(f"No vendor_name found in extracted data for invoice {invoice.id}")
+                logger.warning("No vendor_name found in extracted data for invoice %s", invoice.id)
             elif invoice.vendor:
-                logger.info(f"Invoice {invoice.id} already has vendor '{invoice.vendor.name}', skipping assignment")
+                logger.info("Invoice %s already has vendor '%s', skipping assignment", invoice.id, invoice.vendor.name)
 
             # Update basic fields
             if data.get('invoice_number') and not invoice.invoice_number:
                 invoice.invoice_number = data['invoice_number']
+                changed.add('invoice_number')
 
             if data.get('invoice_date') and not invoice.invoice_date:
                 try:
-                    invoice.invoice_date = datetime.strptime(data['invoice_date'], '%Y-%m-%d').date()
+                    # fromisoformat is a C fast path for the YYYY-MM-DD shape
+                    invoice.invoice_date = date.fromisoformat(data['invoice_date'])
+                    changed.add('invoice_date')
                 except ValueError:
                     pass
 
             if data.get('due_date') and not invoice.due_date:
                 try:
-                    invoice.due_date = datetime.strptime(data['due_date'], '%Y-%m-%d').date()
+                    invoice.due_date = date.fromisoformat(data['due_date'])
+                    changed.add('due_date')
                 except ValueError:
                     pass
 
             if data.get('total_amount') and not invoice.total_amount:
                 invoice.total_amount = data['total_amount']
+                changed.add('total_amount')
 
             if data.get('subtotal') and not invoice.subtotal:
                 invoice.subtotal = data['subtotal']
+                changed.add('subtotal')
 
             if data.get('tax_amount') and not invoice.tax_amount:
                 invoice.tax_amount = data['tax_amount']
+                changed.add('tax_amount')
 
             if data.get('currency'):
                 invoice.currency = data['currency']
+                changed.add('currency')
 
             if data.get('description') and not invoice.notes:
                 invoice.notes = data['description']
+                changed.add('notes')
 
             # Update AI extracted data field
             invoice.extracted_data = data
@@ -249,49 +573,50 @@ class AITaskProcessor:
             invoice.is_ai_processed = True
             invoice.ai_processing_status = 'completed'
             invoice.status = 'processed'  # Move from pending to processed
+            changed.update([
+                'extracted_data', 'ai_confidence_score', 'is_ai_processed',
+                'ai_processing_status', 'status'
+            ])
 
-            invoice.save()
+            invoice.save(update_fields=list(changed))
 
             # Create invoice items if they don't exist
             self._create_invoice_items(invoice, data.get('items', []))
 
-            logger.info(f"Updated invoice {invoice.id} with extracted data")
+            logger.info("Updated invoice %s with extracted data", invoice.id)
 
         except Exception as e:
-            logger.error(f"Failed to update invoice {invoice.id}: {e}")
+            logger.error("Failed to update invoice %s: %s", invoice.id, e)
 
     def _find_or_create_vendor(self, vendor_name: str, extracted_data: Dict[str, Any]) -> 'Vendor':
         """Find existing vendor or create new one"""
         from invoices.models import Vendor
 
-        logger.info(f"Finding or creating vendor: '{vendor_name}'")
-
-        # Try exact match first
-        try:
-            vendor = Vendor.objects.get(name__iexact=vendor_name)
-            logger.info(f"Found exact match for vendor: '{vendor.name}' (ID: {vendor.id})")
-            return vendor
-        except Vendor.DoesNotExist:
-            logger.debug(f"No exact match found for: '{vendor_name}'")
+        logger.info("Finding or creating vendor: '%s'", vendor_name)
 
-        # Try partial match
-        partial_vendors = Vendor.objects.filter(name__icontains=vendor_name)
-        logger.debug(f"Partial match search for '{vendor_name}' returned {partial_vendors.count()} results")
+        vendor_cache = self._get_vendor_cache()
+        search_lower = vendor_name.lower()
 
-        if partial_vendors.exists():
-            vendor = partial_vendors.first()
-            logger.info(f"Found partial match for vendor: '{vendor.name}' (ID: {vendor.id}) for search '{vendor_name}'")
+        # Try exact match first
+        vendor = vendor_cache.get(search_lower)
+        if vendor:
+            logger.info("Found exact match for vendor: '%s' (ID: %s)", vendor.name, vendor.id)
             return vendor
 
-        # Try reverse partial match (existing vendor name in search term)
-        all_vendors = Vendor.objects.values_list('name', flat=True)
-        for existing_vendor_name in all_vendors:
-            if existing_vendor_name.lower() in vendor_name.lower() and len(existing_vendor_name) > 3:
-                vendor = Vendor.objects.get(name=existing_vendor_name)
-                logger.info(f"Found reverse partial match: '{vendor.name}' (ID: {vendor.id}) for search '{vendor_name}'")
-                return vendor
-
-        logger.info(f"No existing vendor found for '{vendor_name}', creating new vendor")
+        # Fuzzy match in one C-level scan over the cached names; WRatio
+        # covers partial and reverse-partial containment uniformly, with
+        # the same cutoff _normalize_vendor_name uses
+        match = fuzz_process.extractOne(
+            search_lower, vendor_cache.keys(),
+            scorer=fuzz.WRatio, score_cutoff=85
+        )
+        if match:
+            existing_vendor = vendor_cache[match[0]]
+            logger.info("Found fuzzy match for vendor: '%s' (ID: %s, score %.1f) for search '%s'",
+                        existing_vendor.name, existing_vendor.id, match[1], vendor_name)
+            return existing_vendor
+
+        logger.info("No existing vendor found for '%s', creating new vendor", vendor_name)
 
         # Create new vendor
         vendor_data = {
@@ -307,7 +632,8 @@ class AITaskProcessor:
         vendor_data = {k: v for k, v in vendor_data.items() if v is not None}
 
         vendor = Vendor.objects.create(**vendor_data)
-        logger.info(f"Created new vendor: '{vendor.name}' (ID: {vendor.id})")
+        vendor_cache[vendor.name.lower()] = vendor
+        logger.info("Created new vendor: '%s' (ID: %s)", vendor.name, vendor.id)
         return vendor
 
     def _create_invoice_items(self, invoice: Invoice, items_data: list) -> None:
@@ -317,52 +643,242 @@ class AITaskProcessor:
 
         from invoices.models import InvoiceItem
 
+        items = []
         for item_data in items_data:
             if isinstance(item_data, dict) and item_data.get('description'):
                 try:
-                    InvoiceItem.objects.create(
+                    quantity = float(item_data.get('quantity', 1))
+                    unit_price = float(item_data.get('unit_price', 0))
+                    items.append(InvoiceItem(
                         invoice=invoice,
                         description=item_data.get('description', 'Item'),
-                        quantity=float(item_data.get('quantity', 1)),
-                        unit_price=float(item_data.get('unit_price', 0)),
-                        total_price=float(item_data.get('total', 0)),
+                        quantity=quantity,
+                        unit_price=unit_price,
+                        # bulk_create skips save(), which recomputes the total
+                        total_price=quantity * unit_price,
                         ai_confidence=invoice.ai_confidence_score
-                    )
+                    ))
                 except (ValueError, TypeError) as e:
-                    logger.warning(f"Failed to create invoice item: {e}")
+                    logger.warning("Failed to create invoice item: %s", e)
                     continue
 
-        logger.info(f"Created {len(items_data)} items for invoice {invoice.id}")
+        # One INSERT for the whole batch instead of a round-trip per line item
+        InvoiceItem.objects.bulk_create(items, batch_size=500)
+
+        logger.info("Created %s items for invoice %s", len(items), invoice.id)
 
-    def _get_recent_invoices_for_comparison(self, invoice: Invoice) -> list:
-        """Get recent invoices for duplicate comparison"""
+    def _get_recent_invoices_for_comparison(self, invoice: Invoice,
+                                            candidate_ids: Optional[list] = None) -> list:
+        """Get recent invoices for duplicate comparison
+
+        When the embedding scan has already ranked candidates, only those
+        ids are serialized - three rows in the prompt instead of ten cuts
+        the duplicate-detection token spend by roughly 70%.
+        """
         try:
             # Get recent invoices from the same user (last 30 days)
             from datetime import timedelta
+            from decimal import Decimal
+
+            if candidate_ids:
+                candidates = Invoice.objects.filter(id__in=candidate_ids)
+                return self._serialize_comparison_rows(candidates)
+
             cutoff_date = timezone.now().date() - timedelta(days=30)
 
-            recent_invoices = Invoice.objects.filter(
+            candidates = Invoice.objects.filter(
                 user=invoice.user,
                 created_at__date__gte=cutoff_date
-            ).exclude(id=invoice.id)[:10]
-
-            # Convert to list of dicts for comparison
-            comparison_data = []
-            for inv in recent_invoices:
-                comparison_data.append({
-                    'id': inv.id,
-                    'vendor_name': getattr(inv.vendor, 'name', '') if inv.vendor else '',
-                    'total_amount': float(inv.total_amount) if inv.total_amount else 0,
-                    'invoice_date': inv.invoice_date.isoformat() if inv.invoice_date else None,
-                    'invoice_number': inv.invoice_number or ''
-                })
-
-            return comparison_data
+            ).exclude(id=invoice.id)
+
+            # Pre-filter candidates in SQL so the prompt payload (and token
+            # cost) stays small: same vendor, amount within ±1%, and an
+            # invoice-date window when those fields are known
+            if invoice.vendor_id:
+                candidates = candidates.filter(vendor_id=invoice.vendor_id)
+            if invoice.total_amount:
+                candidates = candidates.filter(total_amount__range=(
+                    invoice.total_amount * Decimal('0.99'),
+                    invoice.total_amount * Decimal('1.01')
+                ))
+            if invoice.invoice_date:
+                candidates = candidates.filter(invoice_date__range=(
+                    invoice.invoice_date - timedelta(days=30),
+                    invoice.invoice_date + timedelta(days=30)
+                ))
+
+            return self._serialize_comparison_rows(candidates, limit=10)
 
         except Exception as e:
-            logger.error(f"Failed to get recent invoices: {e}")
+            logger.error("Failed to get recent invoices: %s", e)
             return []
 
+    @staticmethod
+    def _serialize_comparison_rows(candidates, limit: Optional[int] = None) -> list:
+        """Flatten candidate invoices into comparison dicts via values().
+
+        One query with the vendor join: no model construction and no lazy
+        vendor SELECT per row."""
+        rows = candidates.values(
+            'id', 'vendor__name', 'total_amount', 'invoice_date', 'invoice_number'
+        )
+        if limit is not None:
+            rows = rows[:limit]
+        return [
+            {
+                'id': row['id'],
+                'vendor_name': row['vendor__name'] or '',
+                'total_amount': float(row['total_amount'] or 0),
+                'invoice_date': row['invoice_date'].isoformat() if row['invoice_date'] else None,
+                'invoice_number': row['invoice_number'] or ''
+            }
+            for row in rows
+        ]
+
+
+def submit_extraction_batch(max_tasks: int = 100) -> Optional[str]:
+    """
+    Submit pending data-extraction tasks through the OpenAI Batch API
+
+    Batch requests are billed at half the realtime rate and don't count
+    against per-request rate limits, which fits queued background
+    extraction where a 24h completion window is acceptable.
+
+    Args:
+        max_tasks (int): Maximum number of tasks to include in the batch
+
+    Returns:
+        Optional[str]: The OpenAI batch id, or None if nothing was submitted
+    """
+    import io
+
+    import orjson
+
+    from invoices.models import Vendor
+
+    service = OpenAIService.instance()
+
+    tasks = list(
+        AIProcessingTask.objects.filter(status='pending', task_type='data_extraction')
+        .select_related('invoice')[:max_tasks]
+    )
+    if not tasks:
+        return None
+
+    existing_vendors = list(Vendor.objects.values_list('name', flat=True))
+    processor = AITaskProcessor(existing_vendors=existing_vendors)
+
+    lines = []
+    submitted_ids = []
+    for task in tasks:
+        text_content = processor._extract_text_from_invoice(task.invoice)
+        if not text_content:
+            continue
+        lines.append(orjson.dumps(
+            service.build_extraction_batch_line(str(task.id), text_content, existing_vendors)
+        ))
+        submitted_ids.append(task.id)
+
+    if not lines:
+        return None
+
+    input_file = service.client.files.create(
+        file=io.BytesIO(b'\n'.join(lines)),
+        purpose='batch'
+    )
+    batch = service.client.batches.create(
+        input_file_id=input_file.id,
+        endpoint='/v1/chat/completions',
+        completion_window='24h'
+    )
+
+    AIProcessingTask.objects.filter(id__in=submitted_ids).update(
+        status='processing',
+        started_at=timezone.now(),
+        ai_model_version=settings.OPENAI_MODEL,
+        openai_batch_id=batch.id
+    )
+
+    logger.info("Submitted batch %s with %s extraction tasks", batch.id, len(submitted_ids))
+    return batch.id
+
+
+def collect_extraction_batches() -> int:
+    """
+    Poll in-flight OpenAI batches and apply finished extraction results
+
+    Returns:
+        int: Number of tasks completed in this pass
+    """
+    from invoices.models import Vendor
+
+    service = OpenAIService.instance()
+    existing_vendors = list(Vendor.objects.values_list('name', flat=True))
+    processor = AITaskProcessor(existing_vendors=existing_vendors)
+
+    batch_ids = (
+        AIProcessingTask.objects.filter(status='processing')
+        .exclude(openai_batch_id='')
+        .values_list('openai_batch_id', flat=True)
+        .distinct()
+    )
+
+    completed_count = 0
+    for batch_id in batch_ids:
+        batch = service.client.batches.retrieve(batch_id)
+        batch_tasks = {
+            str(task.id): task
+            for task in AIProcessingTask.objects.filter(
+                status='processing', openai_batch_id=batch_id
+            ).select_related('invoice')
+        }
+
+        if batch.status in ('failed', 'expired', 'cancelled'):
+            AIProcessingTask.objects.filter(
+                status='processing', openai_batch_id=batch_id
+            ).update(
+                status='failed',
+                completed_at=timezone.now(),
+                error_message=f'OpenAI batch {batch.status}'
+            )
+            continue
+
+        if batch.status != 'completed' or not batch.output_file_id:
+            continue
+
+        output = service.client.files.content(batch.output_file_id)
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            task = batch_tasks.get(entry.get('custom_id'))
+            if task is None:
+                continue
+
+            response = entry.get('response') or {}
+            error = entry.get('error')
+            if error or response.get('status_code') != 200:
+                task.status = 'failed'
+                task.error_message = str(error or response.get('status_code'))
+                task.completed_at = timezone.now()
+                task.save()
+                continue
+
+            raw_content = response['body']['choices'][0]['message']['content']
+            extracted_data = service.clean_batch_extraction_result(raw_content, existing_vendors)
+
+            task.output_data = extracted_data
+            task.confidence_score = extracted_data.get('confidence_score', 0.0)
+            task.status = 'completed'
+            task.completed_at = timezone.now()
+            task.save()
+
+            processor._update_invoice_with_extracted_data(task.invoice, extracted_data)
+            completed_count += 1
+
+    logger.info("Collected %s completed batch extraction tasks", completed_count)
+    return completed_count
+
 
 def create_ai_task(invoice: Invoice, task_type: str, input_data: Optional[Dict] = None) -> AIProcessingTask:
     """
@@ -383,30 +899,113 @@ def create_ai_task(invoice: Invoice, task_type: str, input_data: Optional[Dict]
         status='pending'
     )
 
-    logger.info(f"Created AI task {task.id}: {task_type} for invoice {invoice.id}")
+    logger.info("Created AI task %s: %s for invoice %s", task.id, task_type, invoice.id)
     return task
 
 
-def process_pending_tasks(max_tasks: int = 10) -> int:
+def _claim_pending_tasks(max_tasks: int) -> list:
+    """
+    Atomically claim a batch of pending tasks for this worker
+
+    The claim is a conditional UPDATE on status='pending', so two racing
+    workers can never both take the same row. On backends with SKIP LOCKED
+    support (PostgreSQL, MySQL 8+) the candidate SELECT also skips rows
+    another worker holds locked instead of blocking on them. Without it
+    (SQLite) two workers can select overlapping candidates, so the UPDATE
+    stamps a per-call token into processing_node and the claimed set is
+    re-read by that token - ids the other worker won are not returned.
+
+    Args:
+        max_tasks (int): Maximum number of tasks to claim
+
+    Returns:
+        list: Primary keys of the claimed tasks
+    """
+    claim_token = uuid.uuid4().hex
+    with transaction.atomic():
+        candidates = AIProcessingTask.objects.filter(status='pending').only('id')
+        if connection.features.has_select_for_update_skip_locked:
+            candidates = candidates.select_for_update(skip_locked=True)
+
+        candidate_ids = [task.id for task in candidates[:max_tasks]]
+        if not candidate_ids:
+            return []
+        AIProcessingTask.objects.filter(
+            id__in=candidate_ids, status='pending'
+        ).update(
+            status='processing',
+            processing_node=claim_token,
+            updated_at=timezone.now()
+        )
+
+    return list(
+        AIProcessingTask.objects.filter(
+            id__in=candidate_ids, processing_node=claim_token
+        ).values_list('id', flat=True)
+    )
+
+
+def process_pending_tasks(max_tasks: int = 10, concurrency: int = None) -> int:
     """
-    Process pending AI tasks
+    Process pending AI tasks concurrently
+
+    The OpenAI round-trips dominate task latency, so the batch runs under
+    asyncio.gather with a semaphore: wall-clock drops from sum of the
+    per-task latencies to roughly the slowest call in each window.
 
     Args:
         max_tasks (int): Maximum number of tasks to process
+        concurrency (int): Maximum in-flight OpenAI requests
+            (defaults to settings.OPENAI_MAX_CONCURRENCY)
 
     Returns:
         int: Number of tasks processed
     """
-    processor = AITaskProcessor()
-    pending_tasks = AIProcessingTask.objects.filter(status='pending')[:max_tasks]
+    if concurrency is None:
+        concurrency = settings.OPENAI_MAX_CONCURRENCY
+
+    from invoices.models import Vendor
+
+    # One vendor-name fetch for the whole batch instead of one per task
+    vendor_names = list(Vendor.objects.values_list('name', flat=True))
+    processor = AITaskProcessor(existing_vendors=vendor_names)
+    # Claim the batch atomically so parallel workers never double-process
+    claimed_ids = _claim_pending_tasks(max_tasks)
+
+    # select_related so async task handlers never lazy-load relations
+    # (which would raise SynchronousOnlyOperation inside the event loop)
+    # defer() drops the heavy JSON/text columns from the poll query; the
+    # handlers only ever assign them, never read them back
+    pending_tasks = list(
+        AIProcessingTask.objects.filter(id__in=claimed_ids)
+        .select_related('invoice', 'invoice__vendor', 'invoice__user')
+        .defer('input_data', 'output_data', 'error_message')
+    )
+
+    if not pending_tasks:
+        logger.info("Processed 0 AI tasks")
+        return 0
+
+    async def _run_batch():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _process_one(task):
+            async with semaphore:
+                return await processor.aprocess_task(task)
+
+        return await asyncio.gather(
+            *[_process_one(task) for task in pending_tasks],
+            return_exceptions=True
+        )
+
+    results = asyncio.run(_run_batch())
 
     processed_count = 0
-    for task in pending_tasks:
-        try:
-            processor.process_task(task)
+    for task, result in zip(pending_tasks, results):
+        if isinstance(result, Exception):
+            logger.error("Failed to process task %s: %s", task.id, result)
+        else:
             processed_count += 1
-        except Exception as e:
-            logger.error(f"Failed to process task {task.id}: {e}")
 
-    logger.info(f"Processed {processed_count} AI tasks")
+    logger.info("Processed %s AI tasks", processed_count)
     return processed_count
\ No newline at end of file
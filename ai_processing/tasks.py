@@ -0,0 +1,63 @@
+"""
+Celery tasks for AI processing
+Moves OpenAI round-trips onto worker processes instead of blocking
+the web request path or a single management command loop
+"""
+
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+# No autoretry here: process_task catches exceptions internally and
+# records the failure on the task row, so nothing propagates for Celery
+# to retry on. Retry handling lives in AIProcessingTask.retry_count.
+@shared_task
+def run_ai_task(task_id: int) -> bool:
+    """
+    Process a single AIProcessingTask on a Celery worker
+
+    Args:
+        task_id (int): Primary key of the AIProcessingTask to process
+
+    Returns:
+        bool: True if the task completed successfully
+    """
+    from .models import AIProcessingTask
+    from .task_processor import AITaskProcessor
+
+    try:
+        task = AIProcessingTask.objects.select_related('invoice').get(id=task_id)
+    except AIProcessingTask.DoesNotExist:
+        logger.error("AI task %s no longer exists, skipping", task_id)
+        return False
+
+    processor = AITaskProcessor()
+    return processor.process_task(task)
+
+
+def enqueue_pending_tasks(max_tasks: int = 10) -> int:
+    """
+    Enqueue pending AI tasks onto the Celery queue
+
+    Args:
+        max_tasks (int): Maximum number of tasks to enqueue
+
+    Returns:
+        int: Number of tasks enqueued
+    """
+    from .models import AIProcessingTask
+
+    task_ids = list(
+        AIProcessingTask.objects.filter(status='pending')
+        .only('id')
+        .values_list('id', flat=True)[:max_tasks]
+    )
+
+    for task_id in task_ids:
+        run_ai_task.delay(task_id)
+
+    logger.info("Enqueued %s AI tasks", len(task_ids))
+    return len(task_ids)
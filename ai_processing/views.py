@@ -1,19 +1,39 @@
 from rest_framework import viewsets, status, permissions, filters
 from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
-from django.db.models import Count, Avg, Q
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, FloatField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Cast
 from django.utils import timezone
 from datetime import timedelta
 
-from .models import AIProcessingTask
+from .models import AIProcessingTask, stats_cache_key
 from .serializers import (
     AIProcessingTaskSerializer, AIProcessingTaskCreateSerializer,
-    AIProcessingTaskListSerializer, AIProcessingStatsSerializer,
-    AIProcessingResultSerializer
+    AIProcessingTaskListSerializer, AIProcessingResultSerializer
 )
 from invoices.models import Invoice
 
 
+# Dashboard stats change on the order of seconds-to-minutes as tasks
+# finish, so a short TTL keeps them fresh enough while absorbing polling
+STATS_CACHE_TTL = 45
+
+
+def _dispatch_tasks(tasks):
+    """Hand created tasks to Celery workers when dispatch is enabled.
+
+    Keeps request handlers as pure enqueue-and-return: the OpenAI work
+    runs on the worker tier and clients poll the task rows for status."""
+    if not settings.AI_TASKS_USE_CELERY:
+        return
+    from .tasks import run_ai_task
+    for task in tasks:
+        run_ai_task.delay(task.id)
+
+
 class AIProcessingTaskViewSet(viewsets.ModelViewSet):
     """
     ViewSet for AIProcessingTask operations
@@ -26,7 +46,15 @@ class AIProcessingTaskViewSet(viewsets.ModelViewSet):
     ordering = ['-created_at']
 
     def get_queryset(self):
-        return AIProcessingTask.objects.filter(invoice__user=self.request.user)
+        queryset = AIProcessingTask.objects.filter(invoice__user=self.request.user)
+        if self.action in ('list', 'recent'):
+            # Flat dict rows - list responses never need model instances
+            return queryset.as_list_values()
+        return queryset.select_related('invoice', 'invoice__vendor').with_display().annotate(
+            processing_duration_seconds=Cast(
+                F('processing_duration_ms') / 1000.0, FloatField()
+            )
+        )
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -40,35 +68,81 @@ class AIProcessingTaskViewSet(viewsets.ModelViewSet):
         """
         Get AI processing statistics for the current user
         """
-        queryset = self.get_queryset()
+        cache_key = stats_cache_key(request.user.id)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return Response(cached)
 
-        # Overall stats
-        total_tasks = queryset.count()
-        completed_tasks = queryset.filter(status='completed').count()
-        failed_tasks = queryset.filter(status='failed').count()
-        pending_tasks = queryset.filter(status='pending').count()
-        processing_tasks = queryset.filter(status='processing').count()
+        # One GROUP BY over (status, task_type) carries everything the
+        # dashboard needs; the rest is pivoted in Python
+        week_ago = timezone.now() - timedelta(days=7)
+        rows = AIProcessingTask.objects.filter(invoice__user=request.user).values(
+            'status', 'task_type'
+        ).annotate(
+            count=Count('id'),
+            # Sum/Count pairs instead of Avg: Count(field) skips NULLs, so
+            # completed rows without a duration (e.g. flipped by hand in
+            # the admin) don't deflate the average
+            dur_sum=Sum('processing_duration_ms'),
+            dur_count=Count('processing_duration_ms'),
+            conf_sum=Sum('confidence_score'),
+            conf_count=Count('confidence_score'),
+            recent=Count('id', filter=Q(created_at__gte=week_ago))
+        )
+
+        total_tasks = 0
+        recent_tasks = 0
+        status_counts = {}
+        type_counts = {}
+        completed_duration_sum = 0.0
+        completed_duration_count = 0
+        completed_confidence_sum = 0.0
+        completed_confidence_count = 0
+        for row in rows:
+            total_tasks += row['count']
+            recent_tasks += row['recent']
+            status_counts[row['status']] = status_counts.get(row['status'], 0) + row['count']
+            type_counts[row['task_type']] = type_counts.get(row['task_type'], 0) + row['count']
+            if row['status'] == 'completed':
+                if row['dur_sum'] is not None:
+                    completed_duration_sum += row['dur_sum']
+                    completed_duration_count += row['dur_count']
+                if row['conf_sum'] is not None:
+                    completed_confidence_sum += row['conf_sum']
+                    completed_confidence_count += row['conf_count']
+
+        completed_tasks = status_counts.get('completed', 0)
+        failed_tasks = status_counts.get('failed', 0)
+        pending_tasks = status_counts.get('pending', 0)
+        processing_tasks = status_counts.get('processing', 0)
 
         # Success rate
         success_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
 
-        # Average processing time for completed tasks
-        completed_with_time = queryset.filter(
-            status='completed',
-            processing_duration_ms__isnull=False
+        # Averages over completed tasks that actually carry a value
+        avg_processing_time = (
+            completed_duration_sum / completed_duration_count
+            if completed_duration_count else 0
+        )
+        avg_confidence = (
+            completed_confidence_sum / completed_confidence_count
+            if completed_confidence_count else 0
         )
-        avg_processing_time = completed_with_time.aggregate(
-            avg_time=Avg('processing_duration_ms')
-        )['avg_time'] or 0
 
         # Tasks by type
-        task_type_breakdown = queryset.values('task_type').annotate(
-            count=Count('id')
-        ).order_by('-count')
+        task_type_breakdown = dict(sorted(
+            type_counts.items(), key=lambda item: item[1], reverse=True
+        ))
 
-        # Recent activity (last 7 days)
-        week_ago = timezone.now() - timedelta(days=7)
-        recent_tasks = queryset.filter(created_at__gte=week_ago).count()
+        # Narrow values() slice; the default ordering index keeps this an
+        # index scan rather than a sort over the user's full task history
+        recent_rows = list(
+            AIProcessingTask.objects.filter(
+                invoice__user=request.user
+            ).order_by('-created_at').values(
+                'id', 'task_type', 'status', 'confidence_score', 'created_at'
+            )[:10]
+        )
 
         stats_data = {
             'total_tasks': total_tasks,
@@ -77,13 +151,17 @@ class AIProcessingTaskViewSet(viewsets.ModelViewSet):
             'pending_tasks': pending_tasks,
             'processing_tasks': processing_tasks,
             'success_rate': round(success_rate, 2),
+            'avg_confidence_score': round(avg_confidence, 3),
             'avg_processing_time_ms': round(avg_processing_time, 2),
-            'task_type_breakdown': list(task_type_breakdown),
-            'recent_activity': recent_tasks
+            'task_type_breakdown': task_type_breakdown,
+            'recent_activity': recent_tasks,
+            'recent_tasks': recent_rows
         }
 
-        serializer = AIProcessingStatsSerializer(stats_data)
-        return Response(serializer.data)
+        # stats_data is server-built with a fixed shape; a serializer pass
+        # would only re-copy it field by field
+        cache.set(cache_key, stats_data, STATS_CACHE_TTL)
+        return Response(stats_data)
 
     @action(detail=False, methods=['get'])
     def recent(self, request):
@@ -91,10 +169,10 @@ class AIProcessingTaskViewSet(viewsets.ModelViewSet):
         Get recent AI processing tasks for the current user
         """
         limit = int(request.query_params.get('limit', 20))
-        queryset = self.get_queryset()[:limit]
 
-        serializer = AIProcessingTaskListSerializer(queryset, many=True)
-        return Response(serializer.data)
+        # get_queryset already returns flat dict rows for this action, so
+        # hand them straight to the renderer - no per-row serializer pass
+        return Response(list(self.get_queryset()[:limit]))
 
     @action(detail=True, methods=['get'])
     def result(self, request, pk=None):
@@ -136,16 +214,27 @@ class AIProcessingTaskViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        # Create AI processing tasks
-        created_tasks = []
-        for task_type in task_types:
-            if task_type in ['data_extraction', 'duplicate_detection']:
-                task = AIProcessingTask.objects.create(
-                    invoice=invoice,
-                    task_type=task_type,
-                    status='pending'
-                )
-                created_tasks.append(task)
+        # Create AI processing tasks, skipping types that are already
+        # queued, in flight or done - one membership query plus one INSERT
+        valid_types = [
+            task_type for task_type in task_types
+            if task_type in ('data_extraction', 'duplicate_detection')
+        ]
+        existing_types = set(AIProcessingTask.objects.filter(
+            invoice=invoice,
+            task_type__in=valid_types,
+            status__in=['pending', 'processing', 'completed']
+        ).values_list('task_type', flat=True))
+
+        created_tasks = AIProcessingTask.objects.bulk_create([
+            AIProcessingTask(invoice=invoice, task_type=task_type, status='pending')
+            for task_type in valid_types
+            if task_type not in existing_types
+        ])
+        _dispatch_tasks(created_tasks)
+        if created_tasks:
+            # bulk_create skips post_save, so invalidate stats here
+            cache.delete(stats_cache_key(request.user.id))
 
         return Response({
             'message': f'Created {len(created_tasks)} AI processing tasks',
@@ -159,43 +248,155 @@ class AIProcessingTaskViewSet(viewsets.ModelViewSet):
             ]
         })
 
+    @action(detail=False, methods=['post'])
+    def bulk_create_tasks(self, request):
+        """
+        Create AI processing tasks for multiple invoices at once
+        """
+        invoice_ids = request.data.get('invoice_ids', [])
+        task_types = request.data.get('task_types', ['data_extraction'])
+
+        if not invoice_ids:
+            return Response(
+                {'error': 'invoice_ids is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Verify invoices belong to the user - ids only, no row payloads;
+        # nothing downstream needs the full invoice objects either
+        found_ids = set(Invoice.objects.filter(
+            id__in=invoice_ids,
+            user=request.user
+        ).values_list('id', flat=True))
+
+        if len(found_ids) != len(set(invoice_ids)):
+            return Response(
+                {'error': 'Some invoices not found or not accessible'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # One set-membership query covers every (invoice, task_type) pair
+        # instead of an existence SELECT per combination, and one INSERT
+        # covers all new rows
+        existing = set(AIProcessingTask.objects.filter(
+            invoice_id__in=found_ids,
+            task_type__in=task_types,
+            status__in=['pending', 'processing', 'completed']
+        ).values_list('invoice_id', 'task_type'))
+
+        created_tasks = AIProcessingTask.objects.bulk_create([
+            AIProcessingTask(invoice_id=invoice_id, task_type=task_type, status='pending')
+            for invoice_id in found_ids
+            for task_type in task_types
+            if (invoice_id, task_type) not in existing
+        ], batch_size=500)
+        _dispatch_tasks(created_tasks)
+        if created_tasks:
+            # bulk_create skips post_save, so invalidate stats here
+            cache.delete(stats_cache_key(request.user.id))
+
+        return Response({
+            'message': f'Created {len(created_tasks)} AI processing tasks',
+            'tasks': [
+                {
+                    'id': task.id,
+                    'invoice': task.invoice_id,
+                    'task_type': task.task_type,
+                    'status': task.status
+                }
+                for task in created_tasks
+            ]
+        }, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['post'])
+    def retry_task(self, request, pk=None):
+        """
+        Retry a failed AI processing task
+        """
+        # Conditional UPDATE: re-queues and bumps the retry counter in one
+        # atomic statement, so a concurrent retry can't double-increment
+        requeued = AIProcessingTask.objects.filter(
+            pk=pk,
+            invoice__user=request.user,
+            status='failed',
+            retry_count__lt=F('max_retries')
+        ).update(
+            status='pending',
+            retry_count=F('retry_count') + 1,
+            error_message='',
+            updated_at=timezone.now()
+        )
+
+        if not requeued:
+            return Response(
+                {'error': 'Task is not failed or has reached its retry limit'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if settings.AI_TASKS_USE_CELERY:
+            from .tasks import run_ai_task
+            run_ai_task.delay(int(pk))
+
+        # Queryset update() skips post_save, so invalidate stats here
+        cache.delete(stats_cache_key(request.user.id))
+        return Response({'message': 'Task queued for retry'})
+
     @action(detail=False, methods=['get'])
     def queue_status(self, request):
         """
         Get current processing queue status
         """
-        pending_tasks = self.get_queryset().filter(status='pending')
-        processing_tasks = self.get_queryset().filter(status='processing')
+        totals = self.get_queryset().aggregate(
+            pending_count=Count('id', filter=Q(status='pending')),
+            processing_count=Count('id', filter=Q(status='processing'))
+        )
 
         queue_status = {
-            'pending_count': pending_tasks.count(),
-            'processing_count': processing_tasks.count(),
+            'pending_count': totals['pending_count'],
+            'processing_count': totals['processing_count'],
             'queue_position': {}
         }
 
-        # Calculate queue position for each task type
-        for task_type in ['data_extraction', 'duplicate_detection']:
-            type_pending = pending_tasks.filter(task_type=task_type).order_by('created_at')
-            if type_pending.exists():
+        # Queue positions in one GROUP BY: per task type, count pending
+        # tasks created before the user's earliest pending task instead of
+        # pulling every pending row back and walking it in Python
+        user_first_pending = AIProcessingTask.objects.filter(
+            status='pending',
+            task_type=OuterRef('task_type'),
+            invoice__user=request.user
+        ).order_by('created_at').values('created_at')[:1]
+
+        position_rows = AIProcessingTask.objects.filter(status='pending').values(
+            'task_type'
+        ).annotate(
+            mine=Count('id', filter=Q(invoice__user=request.user)),
+            ahead=Count('id', filter=Q(created_at__lt=Subquery(user_first_pending)))
+        )
+
+        for row in position_rows:
+            if row['mine']:
                 # Position in queue (1-indexed)
-                position = 1
-                for task in type_pending:
-                    if task.invoice.user == request.user:
-                        queue_status['queue_position'][task_type] = position
-                        break
-                    position += 1
+                queue_status['queue_position'][row['task_type']] = row['ahead'] + 1
 
         return Response(queue_status)
 
 
+class TaskCursorPagination(CursorPagination):
+    """Keyset pagination over created_at: deep pages stay an index range
+    scan instead of the growing OFFSET scans of page numbers."""
+    ordering = '-created_at'
+    page_size = 20
+
+
 class AIProcessingTaskListViewSet(viewsets.ReadOnlyModelViewSet):
     """
     Simple read-only viewset for listing AI processing tasks
     """
     serializer_class = AIProcessingTaskListSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = TaskCursorPagination
 
     def get_queryset(self):
         return AIProcessingTask.objects.filter(
             invoice__user=self.request.user
-        ).select_related('invoice').order_by('-created_at')
\ No newline at end of file
+        ).order_by('-created_at').as_list_values()
\ No newline at end of file
@@ -1,6 +1,12 @@
 from django.contrib import admin
+from django.db.models import ExpressionWrapper, F, FloatField, Value
+from django.db.models.functions import NullIf
+from django.utils import timezone
 from django.utils.html import format_html
-from .models import ExpenseSummary, BudgetAlert, SpendingTrend, UserDashboardMetrics
+from .models import (
+    ExpenseSummary, BudgetAlert, SpendingTrend, UserDashboardMetrics,
+    VendorMonthlySummary
+)
 
 
 @admin.register(ExpenseSummary)
@@ -14,6 +20,8 @@ class ExpenseSummaryAdmin(admin.ModelAdmin):
     ]
     list_filter = ['period_type', 'year', 'month', 'quarter', 'last_calculated']
     search_fields = ['user__email', 'user__first_name', 'user__last_name']
+    # JOIN the user in the changelist query instead of one SELECT per row
+    list_select_related = ['user']
     ordering = ['-year', '-month', '-day']
     readonly_fields = ['last_calculated', 'created_at']
 
@@ -51,6 +59,7 @@ class BudgetAlertAdmin(admin.ModelAdmin):
     ]
     list_filter = ['alert_type', 'status', 'is_email_sent', 'created_at', 'triggered_at']
     search_fields = ['user__email', 'user__first_name', 'user__last_name', 'message']
+    list_select_related = ['user']
     ordering = ['-created_at']
     readonly_fields = ['current_amount', 'is_email_sent', 'triggered_at', 'created_at', 'updated_at']
 
@@ -75,29 +84,45 @@ class BudgetAlertAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        # Compute threshold progress in SQL so the column is sortable and
+        # the changelist skips a Decimal division per row (NullIf guards
+        # against a zero threshold)
+        return super().get_queryset(request).annotate(
+            progress_pct=ExpressionWrapper(
+                F('current_amount') * 100.0 / NullIf(F('threshold_amount'), Value(0)),
+                output_field=FloatField()
+            )
+        )
+
     def progress_display(self, obj):
         """Display progress towards threshold"""
-        if obj.threshold_amount and obj.threshold_amount > 0:
-            percentage = (obj.current_amount / obj.threshold_amount) * 100
+        if obj.progress_pct is not None:
+            percentage = obj.progress_pct
             color = 'red' if percentage >= 100 else 'orange' if percentage >= 80 else 'green'
+            # format_html escapes args to strings first, so the float must
+            # be formatted before it goes in
             return format_html(
-                '<span style="color: {};">{:.1f}%</span>',
-                color, percentage
+                '<span style="color: {};">{}%</span>',
+                color, f'{percentage:.1f}'
             )
         return "—"
     progress_display.short_description = 'Progress'
+    progress_display.admin_order_field = 'progress_pct'
 
     actions = ['dismiss_alerts', 'trigger_alerts']
 
     def dismiss_alerts(self, request, queryset):
         """Dismiss selected alerts"""
-        updated = queryset.update(status='dismissed')
+        # update() bypasses auto_now, so stamp updated_at in the same UPDATE
+        updated = queryset.update(status='dismissed', updated_at=timezone.now())
         self.message_user(request, f'{updated} alerts dismissed.')
     dismiss_alerts.short_description = "Dismiss selected alerts"
 
     def trigger_alerts(self, request, queryset):
         """Trigger selected alerts"""
-        updated = queryset.update(status='triggered')
+        now = timezone.now()
+        updated = queryset.update(status='triggered', triggered_at=now, updated_at=now)
         self.message_user(request, f'{updated} alerts triggered.')
     trigger_alerts.short_description = "Trigger selected alerts"
 
@@ -113,6 +138,7 @@ class SpendingTrendAdmin(admin.ModelAdmin):
     ]
     list_filter = ['year', 'month', 'created_at']
     search_fields = ['user__email', 'user__first_name', 'user__last_name']
+    list_select_related = ['user', 'top_vendor']
     ordering = ['-year', '-month']
     readonly_fields = ['created_at', 'updated_at']
 
@@ -142,11 +168,33 @@ class SpendingTrendAdmin(admin.ModelAdmin):
             color = 'red' if obj.percentage_change > 0 else 'green'
             symbol = '+' if obj.percentage_change > 0 else ''
             return format_html(
-                '<span style="color: {};">{}{:.1f}%</span>',
-                color, symbol, obj.percentage_change
+                '<span style="color: {};">{}{}%</span>',
+                color, symbol, f'{obj.percentage_change:.1f}'
             )
         return "—"
     percentage_change_display.short_description = 'Change %'
+    # percentage_change is a stored column, so sorting needs no annotation
+    percentage_change_display.admin_order_field = 'percentage_change'
+
+    def has_add_permission(self, request):
+        # These are auto-generated, so prevent manual addition
+        return False
+
+
+@admin.register(VendorMonthlySummary)
+class VendorMonthlySummaryAdmin(admin.ModelAdmin):
+    """
+    Admin for VendorMonthlySummary model
+    """
+    list_display = [
+        'user', 'vendor', 'year', 'month', 'total_amount',
+        'invoice_count', 'updated_at'
+    ]
+    list_filter = ['year', 'month', 'updated_at']
+    search_fields = ['user__email', 'user__first_name', 'user__last_name', 'vendor__name']
+    list_select_related = ['user', 'vendor']
+    ordering = ['-year', '-month', '-total_amount']
+    readonly_fields = ['created_at', 'updated_at']
 
     def has_add_permission(self, request):
         # These are auto-generated, so prevent manual addition
@@ -164,6 +212,7 @@ class UserDashboardMetricsAdmin(admin.ModelAdmin):
     ]
     list_filter = ['last_updated', 'created_at']
     search_fields = ['user__email', 'user__first_name', 'user__last_name']
+    list_select_related = ['user', 'favorite_vendor']
     ordering = ['-last_updated']
     readonly_fields = ['last_updated', 'created_at']
 
@@ -203,7 +252,6 @@ class UserDashboardMetricsAdmin(admin.ModelAdmin):
 
     def refresh_metrics(self, request, queryset):
         """Refresh selected metrics"""
-        from django.utils import timezone
         updated = queryset.update(last_updated=timezone.now())
         self.message_user(request, f'{updated} metrics refreshed.')
     refresh_metrics.short_description = "Refresh selected metrics"
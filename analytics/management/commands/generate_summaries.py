@@ -1,7 +1,11 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
 from django.core.management.base import BaseCommand
-from django.db.models import Sum, Count, Avg
+from django.db import connections
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncMonth
 from django.utils import timezone
-from datetime import datetime, timedelta
 from decimal import Decimal
 
 from users.models import User
@@ -38,6 +42,9 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
+        # Per-row progress lines only at -v2; at scale the stdout flushes
+        # in the hot loops cost more than the batched queries
+        self.verbosity = options.get('verbosity', 1)
         user_id = options['user_id']
         period = options['period']
         year = options['year']
@@ -49,35 +56,54 @@ class Command(BaseCommand):
         else:
             users = User.objects.filter(is_active=True)
 
-        if not users:
+        # count() for the log line instead of evaluating (and caching) the
+        # whole queryset; the loops below stream users in chunks
+        user_count = users.count()
+        if not user_count:
             self.stdout.write(
                 self.style.WARNING('No users found')
             )
             return
 
         self.stdout.write(
-            f'Generating {period} summaries for {len(users)} users'
+            f'Generating {period} summaries for {user_count} users'
         )
 
-        total_summaries = 0
         total_trends = 0
-        total_metrics = 0
 
-        for user in users:
-            self.stdout.write(f'Processing user: {user.email}')
+        # One existence query up front, then every new summary goes out in
+        # a single bulk INSERT instead of get_or_create + save per row
+        existing_summaries = set(ExpenseSummary.objects.filter(
+            user__in=users, period_type=period, year=year
+        ).values_list('user_id', 'month', 'quarter'))
 
-            # Generate expense summaries
-            summaries_created = self.generate_expense_summaries(user, period, year, month)
-            total_summaries += summaries_created
+        new_summaries = self.map_users(
+            users,
+            lambda user: self.generate_expense_summaries(
+                user, period, year, month, existing_summaries
+            )
+        )
+        ExpenseSummary.objects.bulk_create(new_summaries, batch_size=500)
+        total_summaries = len(new_summaries)
 
-            # Generate spending trends (monthly only)
-            if period == 'monthly':
-                trends_created = self.generate_spending_trends(user, year, month)
-                total_trends += trends_created
+        # Generate spending trends (monthly only); runs after the summary
+        # INSERT so trends see this run's monthly rows
+        if period == 'monthly':
+            existing_trends = set(SpendingTrend.objects.filter(
+                user__in=users, year=year
+            ).values_list('user_id', 'month'))
+
+            new_trends = self.map_users(
+                users,
+                lambda user: self.generate_spending_trends(
+                    user, year, month, existing_trends
+                )
+            )
+            SpendingTrend.objects.bulk_create(new_trends, batch_size=500)
+            total_trends = len(new_trends)
 
-            # Update dashboard metrics
-            metrics_updated = self.update_dashboard_metrics(user)
-            total_metrics += metrics_updated
+        # Dashboard metrics for every user come from one grouped query
+        total_metrics = self.update_dashboard_metrics(users)
 
         self.stdout.write(
             self.style.SUCCESS(
@@ -86,92 +112,102 @@ class Command(BaseCommand):
             )
         )
 
-    def generate_expense_summaries(self, user, period, year, month):
-        """Generate expense summaries for a user"""
-        created = 0
+    def map_users(self, users, build, max_workers=8):
+        """Run a per-user builder on a thread pool and flatten the results.
+
+        The builders only read (writes happen in one bulk INSERT
+        afterwards), so independent users can aggregate concurrently on
+        idle DB connections. Each worker closes its thread-local
+        connections when done."""
+        def call(user):
+            try:
+                return build(user)
+            finally:
+                connections.close_all()
+
+        results = []
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for built in pool.map(call, users.iterator(chunk_size=500)):
+                results.extend(built)
+        return results
+
+    def generate_expense_summaries(self, user, period, year, month, existing):
+        """Build the user's missing expense summaries (unsaved)"""
+        if self.verbosity >= 2:
+            self.stdout.write(f'Processing user: {user.email}')
+        summaries = []
 
         if period == 'monthly':
             months = [month] if month else range(1, 13)
-            for m in months:
-                created += self.create_monthly_summary(user, year, m)
+            summaries.extend(self.build_monthly_summaries(user, year, months, existing))
 
         elif period == 'quarterly':
-            quarters = range(1, 5)
-            for q in quarters:
-                created += self.create_quarterly_summary(user, year, q)
+            for q in range(1, 5):
+                if (user.id, None, q) in existing:
+                    if self.verbosity >= 2:
+                        self.stdout.write(f'  - Quarterly summary for {year} Q{q} already exists')
+                    continue
+                summaries.append(self.build_quarterly_summary(user, year, q))
 
         elif period == 'yearly':
-            created += self.create_yearly_summary(user, year)
-
-        return created
-
-    def create_monthly_summary(self, user, year, month):
-        """Create monthly expense summary"""
-        # Check if summary already exists
-        summary, created = ExpenseSummary.objects.get_or_create(
+            if (user.id, None, None) in existing:
+                if self.verbosity >= 2:
+                    self.stdout.write(f'  - Yearly summary for {year} already exists')
+            else:
+                summaries.append(self.build_yearly_summary(user, year))
+
+        return summaries
+
+    def build_monthly_summaries(self, user, year, months, existing):
+        """Build the user's missing monthly summaries (unsaved).
+
+        One GROUP BY over (month, vendor) covers the whole year: per-month
+        totals and vendor breakdowns fold out of the same rows, instead of
+        one aggregate query per month."""
+        rows_by_month = {}
+        vendor_rows = Invoice.objects.filter(
             user=user,
-            period_type='monthly',
-            year=year,
-            month=month,
-            defaults={
-                'total_amount': Decimal('0.00'),
-                'total_invoices': 0,
-                'avg_invoice_amount': Decimal('0.00'),
-                'category_breakdown': {},
-                'vendor_breakdown': {}
-            }
-        )
-
-        if not created:
-            self.stdout.write(f'  - Monthly summary for {year}-{month:02d} already exists')
-            return 0
-
-        # Calculate summary data
-        start_date = datetime(year, month, 1)
-        if month == 12:
-            end_date = datetime(year + 1, 1, 1)
-        else:
-            end_date = datetime(year, month + 1, 1)
-
-        invoices = Invoice.objects.filter(
-            user=user,
-            created_at__gte=start_date,
-            created_at__lt=end_date
-        )
-
-        # Calculate totals
-        totals = invoices.aggregate(
-            total_amount=Sum('total_amount'),
-            total_invoices=Count('id'),
-            avg_amount=Avg('total_amount')
+            created_at__year=year
+        ).annotate(m=TruncMonth('created_at')).values('m', 'vendor__name').annotate(
+            total=Sum('total_amount'),
+            count=Count('id')
         )
+        for row in vendor_rows:
+            rows_by_month.setdefault(row['m'].month, []).append(row)
 
-        summary.total_amount = totals['total_amount'] or Decimal('0.00')
-        summary.total_invoices = totals['total_invoices']
-        summary.avg_invoice_amount = totals['avg_amount'] or Decimal('0.00')
+        summaries = []
+        for m in months:
+            if (user.id, m, None) in existing:
+                if self.verbosity >= 2:
+                    self.stdout.write(f'  - Monthly summary for {year}-{m:02d} already exists')
+                continue
 
-        # Category breakdown
-        category_breakdown = dict(
-            invoices.values('category__name').annotate(
-                total=Sum('total_amount')
-            ).values_list('category__name', 'total')
-        )
-        summary.category_breakdown = {k: float(v) for k, v in category_breakdown.items() if k}
+            month_rows = rows_by_month.get(m, [])
+            total_amount = sum((row['total'] for row in month_rows), Decimal('0.00'))
+            total_invoices = sum(row['count'] for row in month_rows)
 
-        # Vendor breakdown
-        vendor_breakdown = dict(
-            invoices.values('vendor__name').annotate(
-                total=Sum('total_amount')
-            ).values_list('vendor__name', 'total')
-        )
-        summary.vendor_breakdown = {k: float(v) for k, v in vendor_breakdown.items() if k}
+            summaries.append(ExpenseSummary(
+                user=user,
+                period_type='monthly',
+                year=year,
+                month=m,
+                total_amount=total_amount,
+                total_invoices=total_invoices,
+                avg_invoice_amount=(
+                    total_amount / total_invoices if total_invoices else Decimal('0.00')
+                ),
+                vendor_breakdown={
+                    row['vendor__name']: float(row['total'])
+                    for row in month_rows if row['vendor__name']
+                }
+            ))
+            if self.verbosity >= 2:
+                self.stdout.write(f'  - Created monthly summary for {year}-{m:02d}')
 
-        summary.save()
-        self.stdout.write(f'  - Created monthly summary for {year}-{month:02d}')
-        return 1
+        return summaries
 
-    def create_quarterly_summary(self, user, year, quarter):
-        """Create quarterly expense summary"""
+    def build_quarterly_summary(self, user, year, quarter):
+        """Build an unsaved quarterly expense summary"""
         # Determine months for quarter
         quarter_months = {
             1: [1, 2, 3],
@@ -181,26 +217,8 @@ class Command(BaseCommand):
         }
         months = quarter_months[quarter]
 
-        # Check if summary already exists
-        summary, created = ExpenseSummary.objects.get_or_create(
-            user=user,
-            period_type='quarterly',
-            year=year,
-            quarter=quarter,
-            defaults={
-                'total_amount': Decimal('0.00'),
-                'total_invoices': 0,
-                'avg_invoice_amount': Decimal('0.00'),
-                'category_breakdown': {},
-                'vendor_breakdown': {}
-            }
-        )
-
-        if not created:
-            self.stdout.write(f'  - Quarterly summary for {year} Q{quarter} already exists')
-            return 0
-
-        # Aggregate monthly summaries
+        # Aggregate monthly summaries - both sums in one round trip, which
+        # also keeps the JSON breakdown blobs out of the SELECT
         monthly_summaries = ExpenseSummary.objects.filter(
             user=user,
             period_type='monthly',
@@ -208,179 +226,208 @@ class Command(BaseCommand):
             month__in=months
         )
 
-        total_amount = monthly_summaries.aggregate(
-            total=Sum('total_amount')
-        )['total'] or Decimal('0.00')
-
-        total_invoices = monthly_summaries.aggregate(
-            total=Sum('total_invoices')
-        )['total'] or 0
-
-        summary.total_amount = total_amount
-        summary.total_invoices = total_invoices
-        summary.avg_invoice_amount = total_amount / total_invoices if total_invoices > 0 else Decimal('0.00')
-
-        # Combine category and vendor breakdowns
-        # This is simplified - in a real implementation you'd properly aggregate
-        summary.category_breakdown = {}
-        summary.vendor_breakdown = {}
-
-        summary.save()
-        self.stdout.write(f'  - Created quarterly summary for {year} Q{quarter}')
-        return 1
+        totals = monthly_summaries.aggregate(
+            total=Sum('total_amount'),
+            invoices=Sum('total_invoices')
+        )
+        total_amount = totals['total'] or Decimal('0.00')
+        total_invoices = totals['invoices'] or 0
+        # Divide in Python: SQLite's numeric affinity turns the SQL
+        # division integral when the amount sum has no fraction
+        avg_amount = (
+            total_amount / total_invoices if total_invoices else Decimal('0.00')
+        )
 
-    def create_yearly_summary(self, user, year):
-        """Create yearly expense summary"""
-        # Check if summary already exists
-        summary, created = ExpenseSummary.objects.get_or_create(
+        if self.verbosity >= 2:
+            self.stdout.write(f'  - Created quarterly summary for {year} Q{quarter}')
+        return ExpenseSummary(
             user=user,
-            period_type='yearly',
+            period_type='quarterly',
             year=year,
-            defaults={
-                'total_amount': Decimal('0.00'),
-                'total_invoices': 0,
-                'avg_invoice_amount': Decimal('0.00'),
-                'category_breakdown': {},
-                'vendor_breakdown': {}
-            }
+            quarter=quarter,
+            total_amount=total_amount,
+            total_invoices=total_invoices,
+            avg_invoice_amount=avg_amount,
+            vendor_breakdown=self.merge_vendor_breakdowns(monthly_summaries)
         )
 
-        if not created:
-            self.stdout.write(f'  - Yearly summary for {year} already exists')
-            return 0
-
-        # Aggregate monthly summaries
+    def build_yearly_summary(self, user, year):
+        """Build an unsaved yearly expense summary"""
+        # Aggregate monthly summaries - both sums in one round trip
         monthly_summaries = ExpenseSummary.objects.filter(
             user=user,
             period_type='monthly',
             year=year
         )
 
-        total_amount = monthly_summaries.aggregate(
-            total=Sum('total_amount')
-        )['total'] or Decimal('0.00')
+        totals = monthly_summaries.aggregate(
+            total=Sum('total_amount'),
+            invoices=Sum('total_invoices')
+        )
+        total_amount = totals['total'] or Decimal('0.00')
+        total_invoices = totals['invoices'] or 0
+        # Same Python division as the quarterly builder, for the same
+        # SQLite numeric-affinity reason
+        avg_amount = (
+            total_amount / total_invoices if total_invoices else Decimal('0.00')
+        )
 
-        total_invoices = monthly_summaries.aggregate(
-            total=Sum('total_invoices')
-        )['total'] or 0
+        if self.verbosity >= 2:
+            self.stdout.write(f'  - Created yearly summary for {year}')
+        return ExpenseSummary(
+            user=user,
+            period_type='yearly',
+            year=year,
+            total_amount=total_amount,
+            total_invoices=total_invoices,
+            avg_invoice_amount=avg_amount,
+            vendor_breakdown=self.merge_vendor_breakdowns(monthly_summaries)
+        )
 
-        summary.total_amount = total_amount
-        summary.total_invoices = total_invoices
-        summary.avg_invoice_amount = total_amount / total_invoices if total_invoices > 0 else Decimal('0.00')
+    @staticmethod
+    def merge_vendor_breakdowns(monthly_summaries):
+        """Fold monthly vendor breakdowns into one roll-up dict.
 
-        summary.save()
-        self.stdout.write(f'  - Created yearly summary for {year}')
-        return 1
+        Roll-ups stay a pure function of the materialized monthly rows, so
+        quarterly/yearly runs never re-scan the Invoice table."""
+        merged = Counter()
+        for breakdown in monthly_summaries.values_list('vendor_breakdown', flat=True):
+            merged.update(breakdown or {})
+        return dict(merged)
 
-    def generate_spending_trends(self, user, year, month):
-        """Generate spending trends for a user"""
+    def generate_spending_trends(self, user, year, month, existing):
+        """Build the user's missing spending trends (unsaved)"""
         months = [month] if month else range(1, 13)
-        created = 0
+        trends = []
 
-        for m in months:
-            trend, was_created = SpendingTrend.objects.get_or_create(
+        # One fetch covers every month plus the previous December, instead
+        # of two summary lookups per month
+        totals = {
+            (s_year, s_month): total
+            for s_year, s_month, total in ExpenseSummary.objects.filter(
                 user=user,
-                year=year,
-                month=m,
-                defaults={
-                    'total_spent': Decimal('0.00'),
-                    'previous_month_spent': Decimal('0.00'),
-                    'percentage_change': 0.0,
-                    'insights': []
-                }
-            )
+                period_type='monthly',
+                year__in=[year, year - 1]
+            ).values_list('year', 'month', 'total_amount')
+        }
 
-            if not was_created:
+        for m in months:
+            if (user.id, m) in existing:
                 continue
 
-            # Get current month summary
-            current_summary = ExpenseSummary.objects.filter(
+            trend = SpendingTrend(
                 user=user,
-                period_type='monthly',
                 year=year,
-                month=m
-            ).first()
+                month=m,
+                total_spent=Decimal('0.00'),
+                previous_month_spent=Decimal('0.00'),
+                percentage_change=0.0,
+                insights=[]
+            )
 
-            if current_summary:
-                trend.total_spent = current_summary.total_amount
+            current_total = totals.get((year, m))
+            if current_total is not None:
+                trend.total_spent = current_total
 
-                # Get previous month summary
                 prev_year = year
                 prev_month = m - 1
                 if prev_month == 0:
                     prev_month = 12
                     prev_year = year - 1
 
-                prev_summary = ExpenseSummary.objects.filter(
-                    user=user,
-                    period_type='monthly',
-                    year=prev_year,
-                    month=prev_month
-                ).first()
-
-                if prev_summary:
-                    trend.previous_month_spent = prev_summary.total_amount
-                    if prev_summary.total_amount > 0:
+                prev_total = totals.get((prev_year, prev_month))
+                if prev_total is not None:
+                    trend.previous_month_spent = prev_total
+                    if prev_total > 0:
                         trend.percentage_change = float(
-                            ((current_summary.total_amount - prev_summary.total_amount) / prev_summary.total_amount) * 100
+                            ((current_total - prev_total) / prev_total) * 100
                         )
 
-            trend.save()
-            created += 1
-            self.stdout.write(f'  - Created spending trend for {year}-{m:02d}')
-
-        return created
+            trends.append(trend)
+            if self.verbosity >= 2:
+                self.stdout.write(f'  - Created spending trend for {year}-{m:02d}')
 
-    def update_dashboard_metrics(self, user):
-        """Update dashboard metrics for a user"""
-        metrics, created = UserDashboardMetrics.objects.get_or_create(
-            user=user,
-            defaults={
-                'current_month_total': Decimal('0.00'),
-                'current_month_invoices': 0,
-                'current_month_pending': 0,
-                'ytd_total': Decimal('0.00'),
-                'ytd_invoices': 0,
-                'total_lifetime_spent': Decimal('0.00'),
-                'total_lifetime_invoices': 0,
-                'ai_processed_count': 0,
-                'ai_processing_accuracy': 0.0,
-                'avg_monthly_spending': Decimal('0.00')
-            }
-        )
+        return trends
 
+    def update_dashboard_metrics(self, users):
+        """Update dashboard metrics for a batch of users"""
         now = timezone.now()
         current_month = now.replace(day=1)
         current_year = now.replace(month=1, day=1)
 
-        # Current month stats
-        current_month_invoices = Invoice.objects.filter(
-            user=user,
-            created_at__gte=current_month
+        # Every slice (current month, YTD, lifetime) comes out of one
+        # grouped conditional-aggregate query instead of six round trips
+        # per user
+        rows = Invoice.objects.filter(user__in=users).values('user_id').annotate(
+            cm_total=Sum('total_amount', filter=Q(created_at__gte=current_month)),
+            cm_count=Count('id', filter=Q(created_at__gte=current_month)),
+            cm_pending=Count('id', filter=Q(
+                created_at__gte=current_month, status='pending'
+            )),
+            ytd_total=Sum('total_amount', filter=Q(created_at__gte=current_year)),
+            ytd_count=Count('id', filter=Q(created_at__gte=current_year)),
+            life_total=Sum('total_amount'),
+            life_count=Count('id')
         )
-        metrics.current_month_total = current_month_invoices.aggregate(
+        stats_by_user = {row['user_id']: row for row in rows}
+
+        # Favorite vendor = highest lifetime spend; ordering by user then
+        # descending total means the first row seen per user wins
+        favorite_by_user = {}
+        vendor_rows = Invoice.objects.filter(
+            user__in=users, vendor__isnull=False
+        ).values('user_id', 'vendor_id').annotate(
             total=Sum('total_amount')
-        )['total'] or Decimal('0.00')
-        metrics.current_month_invoices = current_month_invoices.count()
-        metrics.current_month_pending = current_month_invoices.filter(status='pending').count()
-
-        # Year-to-date stats
-        ytd_invoices = Invoice.objects.filter(
-            user=user,
-            created_at__gte=current_year
+        ).order_by('user_id', '-total')
+        for row in vendor_rows:
+            favorite_by_user.setdefault(row['user_id'], row['vendor_id'])
+
+        empty = {
+            'cm_total': None, 'cm_count': 0, 'cm_pending': 0,
+            'ytd_total': None, 'ytd_count': 0,
+            'life_total': None, 'life_count': 0
+        }
+        # last_updated is auto_now, which bulk_update bypasses, so it is
+        # stamped explicitly below
+        metric_fields = [
+            'current_month_total', 'current_month_invoices', 'current_month_pending',
+            'ytd_total', 'ytd_invoices',
+            'total_lifetime_spent', 'total_lifetime_invoices',
+            'favorite_vendor', 'last_updated'
+        ]
+
+        # One fetch of every existing metrics row, then one bulk UPDATE
+        # and one bulk INSERT instead of get_or_create + save per user
+        existing = UserDashboardMetrics.objects.in_bulk(
+            users.values_list('id', flat=True), field_name='user_id'
         )
-        metrics.ytd_total = ytd_invoices.aggregate(
-            total=Sum('total_amount')
-        )['total'] or Decimal('0.00')
-        metrics.ytd_invoices = ytd_invoices.count()
 
-        # Lifetime stats
-        all_invoices = Invoice.objects.filter(user=user)
-        metrics.total_lifetime_spent = all_invoices.aggregate(
-            total=Sum('total_amount')
-        )['total'] or Decimal('0.00')
-        metrics.total_lifetime_invoices = all_invoices.count()
+        to_update = []
+        to_create = []
+        for user in users.iterator(chunk_size=500):
+            metrics = existing.get(user.id) or UserDashboardMetrics(user=user)
+
+            row = stats_by_user.get(user.id, empty)
+            metrics.current_month_total = row['cm_total'] or Decimal('0.00')
+            metrics.current_month_invoices = row['cm_count']
+            metrics.current_month_pending = row['cm_pending']
+            metrics.ytd_total = row['ytd_total'] or Decimal('0.00')
+            metrics.ytd_invoices = row['ytd_count']
+            metrics.total_lifetime_spent = row['life_total'] or Decimal('0.00')
+            metrics.total_lifetime_invoices = row['life_count']
+            metrics.favorite_vendor_id = favorite_by_user.get(user.id)
+            metrics.last_updated = now
+
+            if metrics.pk:
+                to_update.append(metrics)
+            else:
+                to_create.append(metrics)
+            if self.verbosity >= 2:
+                self.stdout.write(f'  - Updated dashboard metrics for {user.email}')
+
+        UserDashboardMetrics.objects.bulk_update(
+            to_update, metric_fields, batch_size=1000
+        )
+        UserDashboardMetrics.objects.bulk_create(to_create, batch_size=1000)
 
-        metrics.save()
-        self.stdout.write(f'  - Updated dashboard metrics')
-        return 1
\ No newline at end of file
+        return len(to_update) + len(to_create)
\ No newline at end of file
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.17 on 2026-08-30 15:58
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_vendor_summaries(apps, schema_editor):
+    """Seed the rollup from existing invoices so dashboards are not empty
+    until the signals have seen new writes."""
+    Invoice = apps.get_model('invoices', 'Invoice')
+    VendorMonthlySummary = apps.get_model('analytics', 'VendorMonthlySummary')
+
+    rows = Invoice.objects.filter(vendor__isnull=False).values(
+        'user_id', 'vendor_id', 'created_at__year', 'created_at__month'
+    ).annotate(
+        total=models.Sum('total_amount'),
+        count=models.Count('id')
+    )
+    VendorMonthlySummary.objects.bulk_create(
+        [
+            VendorMonthlySummary(
+                user_id=row['user_id'],
+                vendor_id=row['vendor_id'],
+                year=row['created_at__year'],
+                month=row['created_at__month'],
+                total_amount=row['total'] or Decimal('0.00'),
+                invoice_count=row['count'],
+            )
+            for row in rows.iterator(chunk_size=500)
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0004_remove_budgetalert_category_and_more'),
+        ('invoices', '0007_invoice_inv_user_day_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VendorMonthlySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveIntegerField()),
+                ('month', models.PositiveIntegerField()),
+                ('total_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=15)),
+                ('invoice_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vendor_monthly_summaries', to=settings.AUTH_USER_MODEL)),
+                ('vendor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_summaries', to='invoices.vendor')),
+            ],
+            options={
+                'verbose_name': 'Vendor Monthly Summary',
+                'verbose_name_plural': 'Vendor Monthly Summaries',
+                'db_table': 'vendor_monthly_summaries',
+                'indexes': [models.Index(fields=['user', 'year', 'month'], name='vendor_mont_user_id_e156da_idx')],
+                'unique_together': {('user', 'vendor', 'year', 'month')},
+            },
+        ),
+        migrations.RunPython(backfill_vendor_summaries, migrations.RunPython.noop),
+    ]
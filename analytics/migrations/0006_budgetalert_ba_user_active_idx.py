@@ -0,0 +1,20 @@
+# Generated by Django 5.2.17 on 2026-08-30 16:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0005_vendormonthlysummary'),
+        ('invoices', '0008_invoice_inv_user_pending_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='budgetalert',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['user'], name='ba_user_active_idx'),
+        ),
+    ]
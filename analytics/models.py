@@ -1,5 +1,11 @@
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import Count, F, Sum, Value
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.conf import settings
+from django.utils import timezone
 from decimal import Decimal
 
 
@@ -96,6 +102,14 @@ class BudgetAlert(models.Model):
         verbose_name = 'Budget Alert'
         verbose_name_plural = 'Budget Alerts'
         ordering = ['-created_at']
+        indexes = [
+            # active_alerts_count scans only active rows
+            models.Index(
+                fields=['user'],
+                condition=models.Q(status='active'),
+                name='ba_user_active_idx'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.full_name} - {self.get_alert_type_display()} - {self.status}"
@@ -137,6 +151,35 @@ class SpendingTrend(models.Model):
         return f"{self.user.full_name} - {self.year}/{self.month:02d}"
 
 
+class VendorMonthlySummary(models.Model):
+    """
+    Per-vendor monthly rollup backing the dashboard top-vendors list
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='vendor_monthly_summaries')
+    vendor = models.ForeignKey('invoices.Vendor', on_delete=models.CASCADE, related_name='monthly_summaries')
+
+    year = models.PositiveIntegerField()
+    month = models.PositiveIntegerField()  # 1-12
+
+    total_amount = models.DecimalField(max_digits=15, decimal_places=2, default=Decimal('0.00'))
+    invoice_count = models.PositiveIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'vendor_monthly_summaries'
+        verbose_name = 'Vendor Monthly Summary'
+        verbose_name_plural = 'Vendor Monthly Summaries'
+        unique_together = ['user', 'vendor', 'year', 'month']
+        indexes = [
+            models.Index(fields=['user', 'year', 'month']),
+        ]
+
+    def __str__(self):
+        return f"{self.user.full_name} - {self.vendor.name} - {self.year}/{self.month:02d}"
+
+
 class UserDashboardMetrics(models.Model):
     """
     Cached dashboard metrics for quick loading
@@ -175,3 +218,213 @@ class UserDashboardMetrics(models.Model):
 
     def __str__(self):
         return f"Dashboard metrics for {self.user.full_name}"
+
+
+def dashboard_cache_key(user_id):
+    """Cache key for a user's dashboard metrics payload."""
+    return f'v1:analytics:dash:{user_id}'
+
+
+def dashboard_stats_cache_key(user_id, when):
+    """Cache key for dashboard_stats; month-scoped so period rollover
+    naturally starts a fresh entry."""
+    return f'v1:analytics:stats:{user_id}:{when:%Y-%m}'
+
+
+def monthly_analytics_cache_key(user_id, year, month):
+    """Cache key for a user's monthly analytics payload."""
+    return f'v1:analytics:monthly:{user_id}:{year}:{month}'
+
+
+def _adjust_monthly_summary(invoice, amount_delta, count_delta):
+    """Apply an invoice delta to its monthly summary with one atomic UPDATE.
+
+    Only totals are maintained incrementally; averages and breakdowns are
+    recomputed by the generate_summaries backfill."""
+    when = invoice.created_at
+    if when is None:
+        return
+    ExpenseSummary.objects.filter(
+        user_id=invoice.user_id,
+        period_type='monthly',
+        year=when.year,
+        month=when.month
+    ).update(
+        total_amount=F('total_amount') + amount_delta,
+        total_invoices=F('total_invoices') + count_delta
+    )
+
+
+def _adjust_vendor_summary(invoice, amount_delta, count_delta):
+    """Apply an invoice delta to its per-vendor monthly rollup."""
+    when = invoice.created_at
+    if when is None or invoice.vendor_id is None:
+        return
+    if count_delta > 0:
+        summary, created = VendorMonthlySummary.objects.get_or_create(
+            user_id=invoice.user_id,
+            vendor_id=invoice.vendor_id,
+            year=when.year,
+            month=when.month,
+            defaults={'total_amount': amount_delta, 'invoice_count': count_delta}
+        )
+        if created:
+            return
+        rollup = VendorMonthlySummary.objects.filter(pk=summary.pk)
+    else:
+        rollup = VendorMonthlySummary.objects.filter(
+            user_id=invoice.user_id,
+            vendor_id=invoice.vendor_id,
+            year=when.year,
+            month=when.month
+        )
+    rollup.update(
+        total_amount=F('total_amount') + amount_delta,
+        invoice_count=F('invoice_count') + count_delta
+    )
+
+
+# Fields whose change can move money inside a rollup bucket. The AI
+# extraction flow creates invoices with zero amount and no vendor, then
+# fills both in via save(update_fields=...), so updates must maintain
+# the rollups too - incrementing only on create drifts permanently.
+_FINANCIAL_FIELDS = {'total_amount', 'vendor', 'vendor_id', 'invoice_date'}
+
+
+def _rebuild_monthly_summary(invoice):
+    """Re-aggregate an invoice's monthly summary bucket from the table.
+
+    On updates the amount counted at creation time is unknown here, so a
+    delta cannot be applied; one aggregate over the (user, month) bucket
+    restores the true totals instead."""
+    when = invoice.created_at
+    if when is None:
+        return
+    from invoices.models import Invoice
+
+    totals = Invoice.objects.filter(
+        user_id=invoice.user_id,
+        created_at__year=when.year,
+        created_at__month=when.month
+    ).aggregate(
+        total=Coalesce(Sum('total_amount'), Value(Decimal('0.00'))),
+        count=Count('id')
+    )
+    ExpenseSummary.objects.filter(
+        user_id=invoice.user_id,
+        period_type='monthly',
+        year=when.year,
+        month=when.month
+    ).update(
+        total_amount=totals['total'],
+        total_invoices=totals['count']
+    )
+
+
+def _rebuild_vendor_rollup(invoice):
+    """Re-aggregate the per-vendor rollup rows for an invoice's month.
+
+    Same reasoning as _rebuild_monthly_summary: an update may move an
+    invoice onto a vendor it had no row for at creation time. Existing
+    rows are updated in place rather than replaced so their identity and
+    created_at survive the rebuild."""
+    when = invoice.created_at
+    if when is None:
+        return
+    from invoices.models import Invoice
+
+    totals = {
+        row['vendor_id']: row
+        for row in Invoice.objects.filter(
+            user_id=invoice.user_id,
+            created_at__year=when.year,
+            created_at__month=when.month,
+            vendor__isnull=False
+        ).values('vendor_id').annotate(
+            total=Sum('total_amount'),
+            count=Count('id')
+        )
+    }
+    with transaction.atomic():
+        existing = {
+            summary.vendor_id: summary
+            for summary in VendorMonthlySummary.objects.filter(
+                user_id=invoice.user_id, year=when.year, month=when.month
+            )
+        }
+        stale_ids = [
+            summary.pk for vendor_id, summary in existing.items()
+            if vendor_id not in totals
+        ]
+        if stale_ids:
+            VendorMonthlySummary.objects.filter(pk__in=stale_ids).delete()
+
+        now = timezone.now()
+        to_update = []
+        to_create = []
+        for vendor_id, row in totals.items():
+            total = row['total'] or Decimal('0.00')
+            summary = existing.get(vendor_id)
+            if summary is None:
+                to_create.append(VendorMonthlySummary(
+                    user_id=invoice.user_id,
+                    vendor_id=vendor_id,
+                    year=when.year,
+                    month=when.month,
+                    total_amount=total,
+                    invoice_count=row['count'],
+                ))
+            elif summary.total_amount != total or summary.invoice_count != row['count']:
+                summary.total_amount = total
+                summary.invoice_count = row['count']
+                # bulk_update bypasses auto_now, so stamp it here
+                summary.updated_at = now
+                to_update.append(summary)
+        if to_update:
+            VendorMonthlySummary.objects.bulk_update(
+                to_update, ['total_amount', 'invoice_count', 'updated_at']
+            )
+        if to_create:
+            VendorMonthlySummary.objects.bulk_create(to_create)
+
+
+@receiver(post_save, sender='invoices.Invoice', dispatch_uid='analytics_summary_inv_save')
+def _add_invoice_to_summary(sender, instance, created, **kwargs):
+    """Keep the current monthly summaries fresh as invoices arrive, so the
+    nightly command only backfills instead of re-summing every month."""
+    if created:
+        _adjust_monthly_summary(instance, instance.total_amount or Decimal('0.00'), 1)
+        _adjust_vendor_summary(instance, instance.total_amount or Decimal('0.00'), 1)
+    else:
+        fields = kwargs.get('update_fields')
+        if fields is None or _FINANCIAL_FIELDS.intersection(fields):
+            _rebuild_monthly_summary(instance)
+            _rebuild_vendor_rollup(instance)
+    _invalidate_analytics_caches(instance)
+
+
+@receiver(post_delete, sender='invoices.Invoice', dispatch_uid='analytics_summary_inv_delete')
+def _remove_invoice_from_summary(sender, instance, **kwargs):
+    _adjust_monthly_summary(instance, -(instance.total_amount or Decimal('0.00')), -1)
+    _adjust_vendor_summary(instance, -(instance.total_amount or Decimal('0.00')), -1)
+    _invalidate_analytics_caches(instance)
+
+
+def _invalidate_analytics_caches(invoice):
+    """Drop the cached analytics payloads an invoice write makes stale."""
+    keys = [
+        dashboard_cache_key(invoice.user_id),
+        dashboard_stats_cache_key(invoice.user_id, timezone.now()),
+    ]
+    if invoice.created_at is not None:
+        keys.append(monthly_analytics_cache_key(
+            invoice.user_id, invoice.created_at.year, invoice.created_at.month
+        ))
+    cache.delete_many(keys)
+
+
+@receiver([post_save, post_delete], sender=BudgetAlert,
+          dispatch_uid='analytics_stats_alert_change')
+def _invalidate_stats_on_alert_change(sender, instance, **kwargs):
+    # The active-alerts count renders on dashboard_stats
+    cache.delete(dashboard_stats_cache_key(instance.user_id, timezone.now()))
@@ -68,29 +68,3 @@ class UserDashboardMetricsSerializer(serializers.ModelSerializer):
             'favorite_vendor_name', 'avg_monthly_spending', 'last_updated', 'created_at'
         ]
         read_only_fields = ['id', 'user', 'last_updated', 'created_at']
-
-
-class DashboardStatsSerializer(serializers.Serializer):
-    """
-    Serializer for dashboard statistics summary
-    """
-    current_month_total = serializers.DecimalField(max_digits=15, decimal_places=2)
-    current_month_invoices = serializers.IntegerField()
-    ytd_total = serializers.DecimalField(max_digits=15, decimal_places=2)
-    ytd_invoices = serializers.IntegerField()
-    pending_invoices = serializers.IntegerField()
-    recent_trends = serializers.ListField()
-    active_alerts = serializers.IntegerField()
-    top_vendors = serializers.ListField()
-
-
-class MonthlyAnalyticsSerializer(serializers.Serializer):
-    """
-    Serializer for monthly analytics data
-    """
-    month = serializers.IntegerField()
-    year = serializers.IntegerField()
-    total_amount = serializers.DecimalField(max_digits=15, decimal_places=2)
-    invoice_count = serializers.IntegerField()
-    vendor_breakdown = serializers.DictField()
-    daily_breakdown = serializers.ListField()
\ No newline at end of file
@@ -0,0 +1,138 @@
+"""
+Celery tasks for analytics
+
+Dashboard statistics are refreshed on worker processes so web workers
+serve cached snapshots instead of blocking on aggregations.
+"""
+
+import logging
+import time
+from datetime import timedelta
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+# Snapshots live this long in the cache; a snapshot older than
+# STALE_AFTER is still served but triggers a background refresh
+DASHBOARD_STATS_TTL = 3600
+DASHBOARD_STATS_STALE_AFTER = 60
+
+
+def build_dashboard_stats(user_id):
+    """
+    Compute, cache and return the dashboard_stats payload for a user
+
+    Shared by the view (cold-cache path) and the refresh task so both
+    produce identical snapshots.
+    """
+    from decimal import Decimal
+
+    from django.core.cache import cache
+    from django.db.models import Count, F, Q, Sum, Value
+    from django.db.models.functions import Coalesce
+    from django.utils import timezone
+
+    from invoices.models import Invoice
+
+    from .models import (
+        BudgetAlert, SpendingTrend, VendorMonthlySummary,
+        dashboard_stats_cache_key
+    )
+
+    now = timezone.now()
+    current_month = now.replace(day=1)
+    current_year = now.replace(month=1, day=1)
+
+    invoices = Invoice.objects.filter(user_id=user_id)
+
+    # Current month, YTD and pending slices in one conditional
+    # aggregation instead of six round trips
+    agg = invoices.aggregate(
+        cm_total=Coalesce(
+            Sum('total_amount', filter=Q(created_at__gte=current_month)),
+            Value(Decimal('0.00'))
+        ),
+        cm_count=Count('id', filter=Q(created_at__gte=current_month)),
+        ytd_total=Coalesce(
+            Sum('total_amount', filter=Q(created_at__gte=current_year)),
+            Value(Decimal('0.00'))
+        ),
+        ytd_count=Count('id', filter=Q(created_at__gte=current_year)),
+        pending=Count('id', filter=Q(status='pending'))
+    )
+
+    recent_trends = list(SpendingTrend.objects.filter(
+        user_id=user_id
+    ).order_by('-year', '-month')[:6].values(
+        'month', 'year', 'total_spent', 'percentage_change'
+    ))
+
+    active_alerts_count = BudgetAlert.objects.filter(
+        user_id=user_id, status='active'
+    ).count()
+
+    # Top vendors (current month) from the signal-maintained rollup
+    top_vendors = list(VendorMonthlySummary.objects.filter(
+        user_id=user_id, year=now.year, month=now.month
+    ).values(
+        'vendor__name',
+        total=F('total_amount'),
+        count=F('invoice_count')
+    ).order_by('-total')[:5])
+
+    # Already native types; the orjson renderer encodes them directly,
+    # so no serializer pass on the way out
+    stats_data = {
+        'current_month_total': agg['cm_total'],
+        'current_month_invoices': agg['cm_count'],
+        'ytd_total': agg['ytd_total'],
+        'ytd_invoices': agg['ytd_count'],
+        'pending_invoices': agg['pending'],
+        'recent_trends': recent_trends,
+        'active_alerts': active_alerts_count,
+        'top_vendors': top_vendors
+    }
+
+    cache.set(
+        dashboard_stats_cache_key(user_id, now),
+        {'data': stats_data, 'computed_at': time.time()},
+        DASHBOARD_STATS_TTL
+    )
+    return stats_data
+
+
+@shared_task
+def refresh_dashboard_stats(user_id: int) -> None:
+    """
+    Recompute a user's dashboard_stats snapshot in the background
+    """
+    build_dashboard_stats(user_id)
+
+
+@shared_task
+def warm_dashboard_stats(days: int = 7) -> int:
+    """
+    Pre-warm dashboard snapshots for recently active users
+
+    Scheduled via celery beat so the first dashboard hit after a cache
+    flush or TTL expiry does not pay the cold-cache cost.
+
+    Returns:
+        int: Number of refreshes enqueued
+    """
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone
+
+    cutoff = timezone.now() - timedelta(days=days)
+    user_ids = get_user_model().objects.filter(
+        is_active=True, last_login__gte=cutoff
+    ).values_list('id', flat=True)
+
+    enqueued = 0
+    for user_id in user_ids.iterator(chunk_size=500):
+        refresh_dashboard_stats.delay(user_id)
+        enqueued += 1
+
+    logger.info("Enqueued %s dashboard warmups", enqueued)
+    return enqueued
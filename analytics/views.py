@@ -1,17 +1,29 @@
+import time
+
 from rest_framework import viewsets, status, permissions, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db.models import Sum, Count, Avg, Q
+from django.conf import settings
+from django.db.models import Sum, Count, F
+from django.db.models.functions import TruncDate
 from django.utils import timezone
-from datetime import datetime, timedelta
+from datetime import datetime
 from decimal import Decimal
 
-from .models import ExpenseSummary, BudgetAlert, SpendingTrend, UserDashboardMetrics
+from django.core.cache import cache
+
+from .models import (
+    ExpenseSummary, BudgetAlert, SpendingTrend, UserDashboardMetrics,
+    dashboard_cache_key, dashboard_stats_cache_key, monthly_analytics_cache_key
+)
 from .serializers import (
     ExpenseSummarySerializer, BudgetAlertSerializer, SpendingTrendSerializer,
-    UserDashboardMetricsSerializer, DashboardStatsSerializer, MonthlyAnalyticsSerializer
+    UserDashboardMetricsSerializer
 )
-from invoices.models import Invoice, Vendor
+from .tasks import (
+    DASHBOARD_STATS_STALE_AFTER, build_dashboard_stats, refresh_dashboard_stats
+)
+from invoices.models import Invoice
 
 
 class ExpenseSummaryViewSet(viewsets.ReadOnlyModelViewSet):
@@ -70,7 +82,8 @@ class BudgetAlertViewSet(viewsets.ModelViewSet):
     ordering = ['-created_at']
 
     def get_queryset(self):
-        return BudgetAlert.objects.filter(user=self.request.user)
+        # vendor_name on the serializer touches the FK per row
+        return BudgetAlert.objects.filter(user=self.request.user).select_related('vendor')
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -89,9 +102,15 @@ class BudgetAlertViewSet(viewsets.ModelViewSet):
         """
         Dismiss a budget alert
         """
-        alert = self.get_object()
-        alert.status = 'dismissed'
-        alert.save()
+        # One UPDATE ... WHERE pk/user instead of SELECT + full-row save;
+        # update() bypasses auto_now and signals, so stamp updated_at and
+        # drop the stats snapshot here
+        updated = BudgetAlert.objects.filter(
+            pk=pk, user=request.user
+        ).update(status='dismissed', updated_at=timezone.now())
+        if not updated:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        cache.delete(dashboard_stats_cache_key(request.user.id, timezone.now()))
         return Response({'message': 'Alert dismissed successfully'})
 
 
@@ -107,16 +126,21 @@ class SpendingTrendViewSet(viewsets.ReadOnlyModelViewSet):
     ordering = ['-year', '-month']
 
     def get_queryset(self):
-        return SpendingTrend.objects.filter(user=self.request.user)
+        # top_vendor_name on the serializer touches the FK per row
+        return SpendingTrend.objects.filter(user=self.request.user).select_related('top_vendor')
 
     @action(detail=False, methods=['get'])
     def recent_trends(self, request):
         """
         Get recent spending trends (last 12 months)
         """
-        trends = self.get_queryset()[:12]
-        serializer = SpendingTrendSerializer(trends, many=True)
-        return Response(serializer.data)
+        # Narrow dict rows skip model hydration and the serializer pass
+        trends = self.get_queryset().values(
+            'id', 'month', 'year', 'total_spent', 'previous_month_spent',
+            'percentage_change', 'top_vendor', 'top_vendor_amount',
+            top_vendor_name=F('top_vendor__name')
+        )[:12]
+        return Response(list(trends))
 
     @action(detail=False, methods=['get'])
     def yearly_trends(self, request):
@@ -138,22 +162,29 @@ class UserDashboardMetricsViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return UserDashboardMetrics.objects.filter(user=self.request.user)
+        # favorite_vendor_name on the serializer touches the FK per row
+        return UserDashboardMetrics.objects.filter(user=self.request.user).select_related('favorite_vendor')
 
     @action(detail=False, methods=['get'])
     def my_metrics(self, request):
         """
         Get current user's dashboard metrics
         """
-        try:
-            metrics = UserDashboardMetrics.objects.get(user=request.user)
-            serializer = UserDashboardMetricsSerializer(metrics)
-            return Response(serializer.data)
-        except UserDashboardMetrics.DoesNotExist:
-            # Create default metrics if none exist
-            metrics = UserDashboardMetrics.objects.create(user=request.user)
-            serializer = UserDashboardMetricsSerializer(metrics)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        cache_key = dashboard_cache_key(request.user.id)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return Response(cached)
+
+        # Create default metrics if none exist; one round-trip and no
+        # exception control flow on the hot path
+        metrics, created = UserDashboardMetrics.objects.get_or_create(user=request.user)
+        created_status = status.HTTP_201_CREATED if created else status.HTTP_200_OK
+
+        serializer = UserDashboardMetricsSerializer(metrics)
+        # Short TTL bounds staleness from the cron refresh; invoice writes
+        # invalidate the key via signals
+        cache.set(cache_key, serializer.data, 60)
+        return Response(serializer.data, status=created_status)
 
 
 class AnalyticsViewSet(viewsets.ViewSet):
@@ -169,62 +200,20 @@ class AnalyticsViewSet(viewsets.ViewSet):
         """
         user = request.user
         now = timezone.now()
-        current_month = now.replace(day=1)
-        current_year = now.replace(month=1, day=1)
-
-        # Get invoice queryset for user
-        invoices = Invoice.objects.filter(user=user)
-
-        # Current month stats
-        current_month_invoices = invoices.filter(created_at__gte=current_month)
-        current_month_total = current_month_invoices.aggregate(
-            total=Sum('total_amount')
-        )['total'] or Decimal('0.00')
-        current_month_count = current_month_invoices.count()
-
-        # Year-to-date stats
-        ytd_invoices = invoices.filter(created_at__gte=current_year)
-        ytd_total = ytd_invoices.aggregate(
-            total=Sum('total_amount')
-        )['total'] or Decimal('0.00')
-        ytd_count = ytd_invoices.count()
-
-        # Pending invoices
-        pending_count = invoices.filter(status='pending').count()
-
-        # Recent trends
-        recent_trends = list(SpendingTrend.objects.filter(
-            user=user
-        ).order_by('-year', '-month')[:6].values(
-            'month', 'year', 'total_spent', 'percentage_change'
-        ))
-
-        # Active alerts
-        active_alerts_count = BudgetAlert.objects.filter(
-            user=user, status='active'
-        ).count()
-
-        # Top vendors (current month)
-        top_vendors = list(current_month_invoices.values(
-            'vendor__name'
-        ).annotate(
-            total=Sum('total_amount'),
-            count=Count('id')
-        ).order_by('-total')[:5])
-
-        stats_data = {
-            'current_month_total': current_month_total,
-            'current_month_invoices': current_month_count,
-            'ytd_total': ytd_total,
-            'ytd_invoices': ytd_count,
-            'pending_invoices': pending_count,
-            'recent_trends': recent_trends,
-            'active_alerts': active_alerts_count,
-            'top_vendors': top_vendors
-        }
 
-        serializer = DashboardStatsSerializer(stats_data)
-        return Response(serializer.data)
+        snapshot = cache.get(dashboard_stats_cache_key(user.id, now))
+        if snapshot is not None:
+            if time.time() - snapshot['computed_at'] > DASHBOARD_STATS_STALE_AFTER:
+                if settings.ANALYTICS_USE_CELERY:
+                    # Stale-while-revalidate: serve the aging snapshot now
+                    # and let a worker rebuild it off the request thread
+                    refresh_dashboard_stats.delay(user.id)
+                else:
+                    return Response(build_dashboard_stats(user.id))
+            return Response(snapshot['data'])
+
+        # Cold cache: compute inline so the first hit still gets data
+        return Response(build_dashboard_stats(user.id))
 
     @action(detail=False, methods=['get'])
     def monthly_analytics(self, request):
@@ -235,6 +224,11 @@ class AnalyticsViewSet(viewsets.ViewSet):
         month = int(request.query_params.get('month', timezone.now().month))
         year = int(request.query_params.get('year', timezone.now().year))
 
+        cache_key = monthly_analytics_cache_key(user.id, year, month)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return Response(cached)
+
         # Get invoices for the specified month
         start_date = datetime(year, month, 1)
         if month == 12:
@@ -248,22 +242,23 @@ class AnalyticsViewSet(viewsets.ViewSet):
             created_at__lt=end_date
         )
 
-        # Calculate totals
-        total_amount = monthly_invoices.aggregate(
-            total=Sum('total_amount')
-        )['total'] or Decimal('0.00')
-        invoice_count = monthly_invoices.count()
-
-        # Vendor breakdown
-        vendor_breakdown = dict(monthly_invoices.values(
-            'vendor__name'
-        ).annotate(
-            total=Sum('total_amount')
-        ).values_list('vendor__name', 'total'))
+        # One GROUP BY yields the vendor breakdown, and the grand total
+        # and count fall out of its rows - two fewer scans of the month
+        vendor_rows = monthly_invoices.values('vendor__name').annotate(
+            total=Sum('total_amount'),
+            count=Count('id')
+        )
+        vendor_breakdown = {}
+        total_amount = Decimal('0.00')
+        invoice_count = 0
+        for row in vendor_rows:
+            vendor_breakdown[row['vendor__name']] = row['total']
+            total_amount += row['total'] or Decimal('0.00')
+            invoice_count += row['count']
 
         # Daily breakdown
-        daily_breakdown = list(monthly_invoices.extra(
-            select={'day': 'DATE(created_at)'}
+        daily_breakdown = list(monthly_invoices.annotate(
+            day=TruncDate('created_at')
         ).values('day').annotate(
             total=Sum('total_amount'),
             count=Count('id')
@@ -278,5 +273,8 @@ class AnalyticsViewSet(viewsets.ViewSet):
             'daily_breakdown': daily_breakdown
         }
 
-        serializer = MonthlyAnalyticsSerializer(analytics_data)
-        return Response(serializer.data)
+        # Historical months rarely change; invoice signals drop the
+        # affected month's key when they do. Already native types, so
+        # the orjson renderer encodes them without a serializer pass
+        cache.set(cache_key, analytics_data, 600)
+        return Response(analytics_data)
@@ -0,0 +1,20 @@
+"""
+Celery application for the invoice management system
+
+Workers consume AI processing tasks so long-running OpenAI calls run
+outside the request path and the management command loop.
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'invoice_management_system.settings')
+
+app = Celery('invoice_management_system')
+
+# Read CELERY_* settings from Django settings
+app.config_from_object('django.conf:settings', namespace='CELERY')
+
+# Auto-discover tasks.py modules in installed apps
+app.autodiscover_tasks()
@@ -0,0 +1,27 @@
+"""
+Custom DRF renderers
+"""
+
+import orjson
+
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson instead of stdlib json
+
+    orjson encodes in native code, 2-5x faster than json.dumps - the
+    same trade the model layer already makes with OrjsonJSONField.
+    Decimals are rendered through str(), preserving their exact digits.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        try:
+            return orjson.dumps(data, default=str)
+        except TypeError:
+            # orjson rejects a few shapes stdlib json accepts (e.g. None
+            # dict keys); fall back rather than fail the response
+            return super().render(data, accepted_media_type, renderer_context)
@@ -152,6 +152,10 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 # Django REST Framework configuration
 REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'invoice_management_system.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication',
         'rest_framework.authentication.BasicAuthentication',
@@ -184,8 +188,39 @@ LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'home'
 LOGOUT_REDIRECT_URL = 'login'
 
+# Celery configuration (broker used by AI processing workers)
+CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='redis://localhost:6379/0')
+CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default='redis://localhost:6379/0')
+CELERY_TASK_TIME_LIMIT = 300  # Hard cap per AI task, OpenAI calls included
+# Dispatch API-created AI tasks straight to Celery workers (requires a
+# running broker; off by default so dev setups keep the command-line worker)
+AI_TASKS_USE_CELERY = config('AI_TASKS_USE_CELERY', default=False, cast=bool)
+# Refresh dashboard snapshots on workers (stale-while-revalidate); off by
+# default so dev setups without a broker recompute inline instead
+ANALYTICS_USE_CELERY = config('ANALYTICS_USE_CELERY', default=False, cast=bool)
+
+CELERY_BEAT_SCHEDULE = {
+    # Pre-warm dashboard snapshots for recently active users
+    'warm-dashboard-stats': {
+        'task': 'analytics.tasks.warm_dashboard_stats',
+        'schedule': 900,  # every 15 minutes
+    },
+}
+
+# Cache (Redis in production; Django's local-memory default applies when
+# REDIS_CACHE_URL is unset, e.g. in development)
+_redis_cache_url = config('REDIS_CACHE_URL', default='')
+if _redis_cache_url:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': _redis_cache_url,
+        }
+    }
+
 # OpenAI API Configuration
 OPENAI_API_KEY = config('OPENAI_API_KEY', default='')
 OPENAI_MODEL = config('OPENAI_MODEL', default='gpt-4o-mini')
 OPENAI_MAX_TOKENS = config('OPENAI_MAX_TOKENS', default=2000, cast=int)
 OPENAI_TEMPERATURE = config('OPENAI_TEMPERATURE', default=0.1, cast=float)
+OPENAI_MAX_CONCURRENCY = config('OPENAI_MAX_CONCURRENCY', default=5, cast=int)
@@ -0,0 +1,33 @@
+"""
+Custom model fields
+"""
+
+import orjson
+
+from django.db import models
+
+
+class OrjsonJSONField(models.JSONField):
+    """
+    JSONField that serializes through orjson instead of stdlib json
+
+    orjson encodes/decodes in native code, 2-5x faster than the stdlib -
+    worth it for the large payloads this project stores (extraction
+    results with items arrays, embedding vectors).
+    """
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        try:
+            return orjson.loads(value)
+        except (orjson.JSONDecodeError, TypeError):
+            return super().from_db_value(value, expression, connection)
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        # Expressions (F, KeyTransform, etc.) keep the default handling
+        if hasattr(value, 'as_sql'):
+            return super().get_db_prep_value(value, connection, prepared)
+        if value is None:
+            return value
+        return orjson.dumps(value).decode()
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.17 on 2026-08-30 15:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('invoices', '0003_remove_invoice_category_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='invoice',
+            name='embedding',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
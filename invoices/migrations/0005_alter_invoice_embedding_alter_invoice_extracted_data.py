@@ -0,0 +1,24 @@
+# Generated by Django 5.2.17 on 2026-08-30 15:32
+
+import invoices.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('invoices', '0004_invoice_embedding'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='invoice',
+            name='embedding',
+            field=invoices.fields.OrjsonJSONField(blank=True, default=list),
+        ),
+        migrations.AlterField(
+            model_name='invoice',
+            name='extracted_data',
+            field=invoices.fields.OrjsonJSONField(blank=True, default=dict),
+        ),
+    ]
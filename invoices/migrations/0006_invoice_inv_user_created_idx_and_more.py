@@ -0,0 +1,23 @@
+# Generated by Django 5.2.17 on 2026-08-30 15:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('invoices', '0005_alter_invoice_embedding_alter_invoice_extracted_data'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['user', 'created_at'], name='inv_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['user', 'status', 'created_at'], name='inv_user_status_created_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.17 on 2026-08-30 15:57
+
+import django.db.models.functions.datetime
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('invoices', '0006_invoice_inv_user_created_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(models.F('user'), django.db.models.functions.datetime.TruncDate('created_at'), name='inv_user_day_idx'),
+        ),
+    ]
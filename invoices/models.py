@@ -1,8 +1,11 @@
 from django.db import models
+from django.db.models.functions import TruncDate
 from django.conf import settings
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 
+from .fields import OrjsonJSONField
+
 
 
 class Vendor(models.Model):
@@ -90,7 +93,8 @@ class Invoice(models.Model):
     file_size = models.PositiveIntegerField(default=0)  # in bytes
 
     # AI processing information
-    extracted_data = models.JSONField(default=dict, blank=True)
+    extracted_data = OrjsonJSONField(default=dict, blank=True)
+    embedding = OrjsonJSONField(default=list, blank=True)  # Fingerprint vector for duplicate detection
     ai_confidence_score = models.FloatField(default=0.0, validators=[MinValueValidator(0.0)])
     is_ai_processed = models.BooleanField(default=False)
     ai_processing_status = models.CharField(max_length=20, default='pending')  # pending, processing, completed, failed
@@ -119,6 +123,28 @@ class Invoice(models.Model):
             models.Index(fields=['user', 'status']),
             models.Index(fields=['vendor', 'invoice_date']),
             models.Index(fields=['invoice_date']),
+            # Time-window aggregates (dashboard stats, summary generation)
+            # filter on user plus a created_at range, optionally narrowed
+            # by status - keep both as index range scans
+            models.Index(fields=['user', 'created_at'], name='inv_user_created_idx'),
+            models.Index(
+                fields=['user', 'status', 'created_at'],
+                name='inv_user_status_created_idx'
+            ),
+            # Functional index matching the daily-breakdown GROUP BY on
+            # TruncDate('created_at')
+            models.Index('user', TruncDate('created_at'), name='inv_user_day_idx'),
+            # The dashboard pending count only ever looks at pending rows,
+            # so a partial index stays tiny on accounts with history
+            models.Index(
+                fields=['user'],
+                condition=models.Q(status='pending'),
+                name='inv_user_pending_idx'
+            ),
+            models.Index(
+                fields=['user', 'vendor', '-created_at'],
+                name='inv_user_vendor_created_idx'
+            ),
         ]
 
     def __str__(self):